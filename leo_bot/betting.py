@@ -11,7 +11,7 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, Optional
 
-from toto_f1_api import TotoF1Client, canonical_key
+from toto_f1_api import TotoF1Client
 
 TOKEN_MULTIPLIER = 100  # store FITs as integer cents
 
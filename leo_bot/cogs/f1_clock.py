@@ -19,6 +19,7 @@ class F1ClockCog(commands.Cog):
         self.bot = bot
         self.config = config
         self._rename_tasks: dict[int, tuple[str, asyncio.Task[None]]] = {}
+        self._applied_names: dict[int, str] = {}
         self._clock_task: asyncio.Task[None] | None = None
 
     async def cog_load(self) -> None:
@@ -68,7 +69,10 @@ class F1ClockCog(commands.Cog):
 
     async def update_channels(self) -> None:
         try:
-            event, session_code, session_dt = find_next_session(self.config.default_timezone)
+            # FastF1 performs blocking disk/network I/O; keep it off the event loop.
+            event, session_code, session_dt = await asyncio.to_thread(
+                find_next_session, self.config.default_timezone
+            )
             if event is None or session_code is None or session_dt is None:
                 logger.info("No upcoming session found.")
                 return
@@ -81,6 +85,10 @@ class F1ClockCog(commands.Cog):
                 self.config.f1_channels["countdown"]: countdown_str,
             }
             for channel_id, target_name in desired.items():
+                # Most ticks leave at least the event name unchanged; skip the
+                # channel lookup (and a possible fetch) for names we already set.
+                if self._applied_names.get(channel_id) == target_name:
+                    continue
                 channel = self.bot.get_channel(channel_id)
                 if channel is None:
                     try:
@@ -96,6 +104,8 @@ class F1ClockCog(commands.Cog):
                     continue
                 if channel.name != target_name:
                     self._schedule_channel_rename(channel, channel_id, target_name)
+                else:
+                    self._applied_names[channel_id] = target_name
         except Exception as exc:  # pragma: no cover
             logger.exception("Error updating F1 channels: %s", exc)
 
@@ -114,6 +124,7 @@ class F1ClockCog(commands.Cog):
         async def _runner() -> None:
             try:
                 await channel.edit(name=target_name, reason="F1 next session update")
+                self._applied_names[channel_id] = target_name
             except asyncio.CancelledError:  # pragma: no cover - cancellation during shutdown
                 raise
             except Exception as exc:  # pragma: no cover - network failure
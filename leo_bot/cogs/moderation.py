@@ -12,11 +12,14 @@ from ..config import BotConfig, DOMAIN_REPLACEMENTS
 
 logger = logging.getLogger(__name__)
 
+LINK_WEBHOOK_NAME = "Leo link fix"
+
 
 class ModerationCog(commands.Cog):
     def __init__(self, bot: commands.Bot, config: BotConfig):
         self.bot = bot
         self.config = config
+        self._webhooks: dict[int, discord.Webhook] = {}
         escaped = "|".join(re.escape(domain) for domain in DOMAIN_REPLACEMENTS.keys())
         self._replacement_pattern = re.compile(
             rf"\bhttps://(www\.)?({escaped})\b", re.IGNORECASE
@@ -51,20 +54,54 @@ class ModerationCog(commands.Cog):
         await self._handle_bot_mentions(message)
 
     async def _handle_domain_replacements(self, message: discord.Message) -> None:
-        if not message.content:
+        # Every rewritable link contains "://", so plain chat never reaches the regex.
+        if not message.content or "://" not in message.content:
+            return
+        new_content, replaced = self._replacement_pattern.subn(
+            self._replace_domain, message.content
+        )
+        if not replaced:
             return
-        if not self._replacement_pattern.search(message.content):
+        if self.config.link_rewrite_mode == "reply":
+            # Hide the original embed and answer with the fixed link instead of
+            # reposting as the author; no webhook or deletion is involved.
+            try:
+                await message.edit(suppress=True)
+            except discord.Forbidden:
+                # Without Manage Messages the embed stays, but the fix is still worth posting.
+                logger.warning("Cannot suppress embeds in channel %s", message.channel.id)
+            await message.reply(
+                new_content,
+                mention_author=False,
+                allowed_mentions=discord.AllowedMentions.none(),
+            )
             return
-        new_content = self._replacement_pattern.sub(self._replace_domain, message.content)
         display_name = message.author.display_name
         avatar_url = message.author.display_avatar.url if message.author.display_avatar else None
-        webhook = await message.channel.create_webhook(name=display_name or message.author.name)
+        webhook = await self._get_webhook(message.channel)
         try:
             await webhook.send(new_content, username=display_name, avatar_url=avatar_url)
-        finally:
-            await webhook.delete()
+        except discord.NotFound:
+            # The cached webhook was deleted from the channel; recreate it once.
+            self._webhooks.pop(message.channel.id, None)
+            webhook = await self._get_webhook(message.channel)
+            await webhook.send(new_content, username=display_name, avatar_url=avatar_url)
         await message.delete()
 
+    async def _get_webhook(self, channel: discord.TextChannel) -> discord.Webhook:
+        webhook = self._webhooks.get(channel.id)
+        if webhook is not None:
+            return webhook
+        bot_id = self.bot.user.id if self.bot.user else None
+        for existing in await channel.webhooks():
+            if existing.token and existing.user and existing.user.id == bot_id:
+                webhook = existing
+                break
+        else:
+            webhook = await channel.create_webhook(name=LINK_WEBHOOK_NAME)
+        self._webhooks[channel.id] = webhook
+        return webhook
+
     async def _handle_bot_mentions(self, message: discord.Message) -> None:
         if not self.bot.user or self.bot.user not in message.mentions:
             return
@@ -102,10 +139,12 @@ class ModerationCog(commands.Cog):
         channel = self.bot.get_channel(payload.channel_id)
         if not isinstance(channel, discord.TextChannel):
             return
-        try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
-            return
+        message = discord.utils.get(self.bot.cached_messages, id=payload.message_id)
+        if message is None:
+            try:
+                message = await channel.fetch_message(payload.message_id)
+            except discord.NotFound:
+                return
         user = payload.member or self.bot.get_user(payload.user_id)
         if not user:
             return
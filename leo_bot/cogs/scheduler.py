@@ -1,13 +1,12 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Literal, Optional
 
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
-import pytz
 
 from ..config import BotConfig
 from ..scheduler import ScheduleManager, ScheduledJob, build_poll, parse_duration, parse_when
@@ -24,10 +23,11 @@ class ScheduleCog(commands.Cog):
 
     def cog_unload(self) -> None:
         self.scheduler_loop.cancel()
+        self.manager.flush()
 
     @tasks.loop(seconds=30)
     async def scheduler_loop(self) -> None:
-        now = datetime.utcnow().replace(tzinfo=pytz.utc)
+        now = datetime.now(timezone.utc)
         for job in list(self.manager.due_jobs(now)):
             await self._execute_job(job)
 
@@ -92,7 +92,7 @@ class ScheduleCog(commands.Cog):
                 "Target must be a text channel.", ephemeral=True
             )
             return
-        job_id = f"{int(datetime.utcnow().timestamp() * 1000)}-{interaction.id}"
+        job_id = f"{int(datetime.now(timezone.utc).timestamp() * 1000)}-{interaction.id}"
         job = ScheduledJob(
             id=job_id,
             kind=kind,
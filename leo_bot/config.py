@@ -3,11 +3,11 @@ from __future__ import annotations
 import logging
 import os
 from dataclasses import dataclass
+from datetime import timezone, tzinfo
 from pathlib import Path
-from typing import Mapping, Optional
+from typing import Literal, Mapping, Optional
 
 import discord
-import pytz
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -27,12 +27,13 @@ class BotConfig:
     report_log_channel_id: int
     f1_channels: Mapping[str, int]
     schedule_path: Path
-    default_timezone: pytz.BaseTzInfo
+    default_timezone: tzinfo
     betting_channel_id: Optional[int] = None
     max_poll_hours: int = 32 * 24
     f1_cache_path: Path = Path(".fastf1cache")
     toto_db_path: Path = Path("toto_f1.sqlite")
     wallet_db_path: Path = Path("wallet.sqlite")
+    link_rewrite_mode: Literal["webhook", "reply"] = "webhook"
 
 
 def _require_env(name: str) -> str:
@@ -79,6 +80,15 @@ def _parse_optional_int_env(name: str) -> Optional[int]:
         raise RuntimeError(f"Environment variable {name} must be an integer") from exc
 
 
+def _parse_link_rewrite_mode() -> Literal["webhook", "reply"]:
+    raw = os.getenv("LINK_REWRITE_MODE", "").strip().lower()
+    if raw in ("", "webhook"):
+        return "webhook"
+    if raw == "reply":
+        return "reply"
+    raise RuntimeError("Environment variable LINK_REWRITE_MODE must be 'webhook' or 'reply'")
+
+
 def build_config() -> BotConfig:
     """Assemble :class:`BotConfig` from environment variables."""
 
@@ -99,9 +109,10 @@ def build_config() -> BotConfig:
         },
         betting_channel_id=_parse_optional_int_env("BETTING_CHANNEL"),
         schedule_path=Path(os.getenv("SCHEDULES_PATH", "schedules.json")),
-        default_timezone=pytz.utc,
+        default_timezone=timezone.utc,
         toto_db_path=Path(os.getenv("TOTO_F1_DB", "toto_f1.sqlite")),
         wallet_db_path=Path(os.getenv("WALLET_DB_PATH", "wallet.sqlite")),
+        link_rewrite_mode=_parse_link_rewrite_mode(),
     )
     return config
 
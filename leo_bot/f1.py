@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import bisect
 import logging
-from datetime import datetime, timezone
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from typing import Any, Iterable, Optional
 
 import fastf1
-import pytz
 
 from .config import BotConfig
 
@@ -22,6 +26,11 @@ _SESSION_LABELS = {
     "R": "GRAND PRIX",
 }
 MAX_CHANNEL_NAME = 100
+SCHEDULE_CACHE_TTL = 6 * 3600
+
+# Per-year cache of every known session, sorted by start time:
+# year -> (expires_at_epoch, [(session_dt_utc, order_index, session_code, event), ...])
+_SCHEDULE_CACHE: dict[int, tuple[float, list[tuple[datetime, int, str, Any]]]] = {}
 
 
 def initialise_cache(config: BotConfig) -> None:
@@ -41,8 +50,22 @@ def to_utc(dt: Any) -> Optional[datetime]:
     return py_dt.astimezone(timezone.utc)
 
 
-def format_local(dt_utc: datetime, tz: pytz.BaseTzInfo) -> str:
-    return dt_utc.astimezone(tz).strftime("%a %d %b %Y • %H:%M UTC")
+def _to_local(dt_utc: datetime, tz: tzinfo) -> datetime:
+    # The bot displays UTC by default, in which case there is nothing to convert.
+    if tz is timezone.utc and dt_utc.utcoffset() == timedelta(0):
+        return dt_utc
+    return dt_utc.astimezone(tz)
+
+
+@lru_cache(maxsize=32)
+def _date_time_strings(dt_utc: datetime, tz: tzinfo) -> tuple[str, str]:
+    local_dt = _to_local(dt_utc, tz)
+    return local_dt.strftime("%a %d %b %Y"), local_dt.strftime("%H:%M UTC")
+
+
+def format_local(dt_utc: datetime, tz: tzinfo) -> str:
+    date_str, time_str = _date_time_strings(dt_utc, tz)
+    return f"{date_str} • {time_str}"
 
 
 def countdown(dt_utc: datetime) -> str:
@@ -50,19 +73,16 @@ def countdown(dt_utc: datetime) -> str:
     remaining = int((dt_utc - now).total_seconds())
     if remaining <= 0:
         return "started"
-    days, remainder = divmod(remaining, 86400)
-    hours, remainder = divmod(remainder, 3600)
-    minutes, _ = divmod(remainder, 60)
-    parts = []
+    days, minutes = divmod(remaining // 60, 1440)
+    hours, minutes = divmod(minutes, 60)
     if days:
-        parts.append(f"{days}d")
-    if days or hours:
-        parts.append(f"{hours}h")
-    parts.append(f"<{minutes}m")
-    return "in " + " ".join(parts)
+        return f"in {days}d {hours}h <{minutes}m"
+    if hours:
+        return f"in {hours}h <{minutes}m"
+    return f"in <{minutes}m"
 
 
-def add_session_fields(embed, event, identifiers: Iterable[str], label: str, tz: pytz.BaseTzInfo) -> None:
+def add_session_fields(embed, event, identifiers: Iterable[str], label: str, tz: tzinfo) -> None:
     for ident in identifiers:
         try:
             dt = event.get_session_date(ident, utc=True)
@@ -80,14 +100,28 @@ def add_session_fields(embed, event, identifiers: Iterable[str], label: str, tz:
         return
 
 
+_TESTING_COLUMNS = ("EventName", "OfficialEventName", "EventFormat", "EventType", "Name")
+
+
 def _is_testing_row(row) -> bool:
     fields = []
-    for column in ("EventName", "OfficialEventName", "EventFormat", "EventType", "Name"):
+    for column in _TESTING_COLUMNS:
         if column in row:
             fields.append(str(row[column]))
     return "test" in " ".join(fields).lower()
 
 
+def _testing_mask(schedule):
+    """Vectorised form of :func:`_is_testing_row` over a whole schedule."""
+
+    mask = None
+    for column in _TESTING_COLUMNS:
+        if column in schedule.columns:
+            hits = schedule[column].astype(str).str.contains("test", case=False, regex=False)
+            mask = hits if mask is None else mask | hits
+    return mask
+
+
 def _iter_race_rounds(schedule) -> list[int]:
     rounds = []
     for value in schedule["RoundNumber"]:
@@ -129,88 +163,102 @@ def _short_event_label(event: dict) -> str:
     return country or name or "Grand Prix"
 
 
-def _format_session_strings(event, session_code: str, session_dt_utc: datetime, tz: pytz.BaseTzInfo) -> tuple[str, str, str, str]:
+def _format_session_strings(event, session_code: str, session_dt_utc: datetime, tz: tzinfo) -> tuple[str, str, str, str]:
     short_event = _short_event_label(event)
     session_label = _SESSION_LABELS.get(session_code, session_code)
-    local_dt = session_dt_utc.astimezone(tz)
 
     name = f"{short_event} – {session_label}"
-    date_str = local_dt.strftime("%a %d %b %Y")
-    time_str = local_dt.strftime("%H:%M UTC")
+    date_str, time_str = _date_time_strings(session_dt_utc, tz)
     countdown_str = countdown(session_dt_utc)
 
     clip = lambda value: value[:MAX_CHANNEL_NAME]
     return clip(name), clip(date_str), clip(time_str), clip(countdown_str)
 
 
-def _format_race_strings(event, race_dt_utc: datetime, tz: pytz.BaseTzInfo) -> tuple[str, str, str, str]:
+def _format_race_strings(event, race_dt_utc: datetime, tz: tzinfo) -> tuple[str, str, str, str]:
     name = event.get("OfficialEventName") or event.get("EventName") or "Grand Prix"
-    local_dt = race_dt_utc.astimezone(tz)
-    date_str = local_dt.strftime("%a %d %b %Y")
-    time_str = local_dt.strftime("%H:%M UTC")
+    date_str, time_str = _date_time_strings(race_dt_utc, tz)
     countdown_str = countdown(race_dt_utc)
 
     clip = lambda value: value[:MAX_CHANNEL_NAME]
     return clip(name), clip(date_str), clip(time_str), clip(countdown_str)
 
 
-def find_next_session(tz: pytz.BaseTzInfo) -> tuple[Any, Optional[str], Optional[datetime]]:
-    now = datetime.now(timezone.utc)
-    year = now.year
-    for _ in range(2):
+def _load_event_schedule(year: int):
+    try:
+        return fastf1.get_event_schedule(year, include_testing=False)
+    except TypeError:  # older fastf1 versions
+        return fastf1.get_event_schedule(year)
+
+
+def _build_session_index(year: int) -> list[tuple[datetime, int, str, Any]]:
+    schedule = _load_event_schedule(year)
+    mask = _testing_mask(schedule)
+    filtered = schedule if mask is None else schedule.loc[~mask]
+    sessions = []
+    for rnd in _iter_race_rounds(filtered):
         try:
-            schedule = fastf1.get_event_schedule(year, include_testing=False)
-        except TypeError:  # older fastf1 versions
-            schedule = fastf1.get_event_schedule(year)
-        filtered = schedule.loc[~schedule.apply(_is_testing_row, axis=1)]
-        candidates = []
-        for rnd in _iter_race_rounds(filtered):
-            try:
-                event = schedule.get_event_by_round(rnd)
-            except Exception:  # pragma: no cover - defensive
-                continue
-            for code, dt_utc in _iter_existing_sessions(event, utc=True):
-                if dt_utc and dt_utc > now:
-                    order = _SESSION_ORDER.index(code)
-                    candidates.append((dt_utc, order, code, event))
-        if candidates:
-            dt_utc, _, code, event = min(candidates, key=lambda item: (item[0], item[1]))
+            event = schedule.get_event_by_round(rnd)
+        except Exception:  # pragma: no cover - defensive
+            continue
+        for code, dt_utc in _iter_existing_sessions(event, utc=True):
+            if dt_utc:
+                sessions.append((dt_utc, _SESSION_ORDER.index(code), code, event))
+    sessions.sort(key=lambda item: (item[0], item[1]))
+    return sessions
+
+
+_session_time = itemgetter(0)
+
+
+def _first_after(sessions: list[tuple[datetime, int, str, Any]], now: datetime) -> int:
+    return bisect.bisect_right(sessions, now, key=_session_time)
+
+
+def _get_sessions_cached(year: int) -> list[tuple[datetime, int, str, Any]]:
+    """Return the sorted session index for ``year``, fetching it at most every few hours.
+
+    Entries also expire as soon as the earliest upcoming session starts so that
+    late timetable changes are picked up when the "next" session moves on.
+    """
+
+    now = time.time()
+    cached = _SCHEDULE_CACHE.get(year)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    sessions = _build_session_index(year)
+    expires_at = now + SCHEDULE_CACHE_TTL
+    index = _first_after(sessions, datetime.fromtimestamp(now, timezone.utc))
+    if index < len(sessions):
+        expires_at = min(expires_at, sessions[index][0].timestamp())
+    _SCHEDULE_CACHE[year] = (expires_at, sessions)
+    return sessions
+
+
+def find_next_session(tz: tzinfo) -> tuple[Any, Optional[str], Optional[datetime]]:
+    now = datetime.now(timezone.utc)
+    for year in (now.year, now.year + 1):
+        sessions = _get_sessions_cached(year)
+        index = _first_after(sessions, now)
+        if index < len(sessions):
+            dt_utc, _, code, event = sessions[index]
             return event, code, dt_utc
-        year += 1
     return None, None, None
 
 
-def find_next_race(tz: pytz.BaseTzInfo):
+def find_next_race(tz: tzinfo):
     now = datetime.now(timezone.utc)
-    year = now.year
-    for _ in range(2):
-        try:
-            schedule = fastf1.get_event_schedule(year, include_testing=False)
-        except TypeError:
-            schedule = fastf1.get_event_schedule(year)
-        filtered = schedule.loc[~schedule.apply(_is_testing_row, axis=1)]
-        candidates = []
-        for rnd in _iter_race_rounds(filtered):
-            try:
-                event = schedule.get_event_by_round(rnd)
-            except Exception as exc:
-                if "testing" in str(exc).lower():
-                    continue
-                continue
-            race_dt = event.get_session_date("R", utc=True)
-            race_dt_utc = to_utc(race_dt)
-            if race_dt_utc and race_dt_utc > now:
-                candidates.append((race_dt_utc, event))
-        if candidates:
-            race_dt_utc, event = min(candidates, key=lambda item: item[0])
-            return event, race_dt_utc
-        year += 1
+    for year in (now.year, now.year + 1):
+        sessions = _get_sessions_cached(year)
+        for dt_utc, _, code, event in islice(sessions, _first_after(sessions, now), None):
+            if code == "R":
+                return event, dt_utc
     return None, None
 
 
-def format_f1_channel_strings(event, race_dt_utc: datetime, tz: pytz.BaseTzInfo) -> tuple[str, str, str, str]:
+def format_f1_channel_strings(event, race_dt_utc: datetime, tz: tzinfo) -> tuple[str, str, str, str]:
     return _format_race_strings(event, race_dt_utc, tz)
 
 
-def format_session_channel_strings(event, session_code: str, session_dt_utc: datetime, tz: pytz.BaseTzInfo) -> tuple[str, str, str, str]:
+def format_session_channel_strings(event, session_code: str, session_dt_utc: datetime, tz: tzinfo) -> tuple[str, str, str, str]:
     return _format_session_strings(event, session_code, session_dt_utc, tz)
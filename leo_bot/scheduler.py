@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+import threading
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional
 
 import discord
-import pytz
 
 from .config import BotConfig
 
 logger = logging.getLogger(__name__)
 
+SAVE_DEBOUNCE_SECONDS = 2.0
 
-@dataclass
+
+@dataclass(slots=True)
 class ScheduledJob:
+    """A scheduled message or poll.
+
+    ``run_at`` is treated as immutable once the job is constructed; its ISO
+    representation is cached for serialisation.
+    """
+
     id: str
     kind: str
     guild_id: Optional[int]
@@ -30,86 +42,219 @@ class ScheduledJob:
     emojis: Optional[List[str]] = None
     allow_multi: bool = False
     duration_s: Optional[int] = None
+    _iso_run_at: str = field(init=False, repr=False, compare=False)
+    _run_at_epoch: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._iso_run_at = self.run_at.isoformat()
+        self._run_at_epoch = self.run_at.timestamp()
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ScheduledJob":
         data = data.copy()
-        data["run_at"] = datetime.fromisoformat(data["run_at"]).astimezone(pytz.utc)
+        run_at = datetime.fromisoformat(data["run_at"])
+        # to_dict always writes UTC timestamps, so only foreign offsets (or
+        # naive values from hand-edited files) need converting.
+        if run_at.utcoffset() != timedelta(0):
+            run_at = run_at.astimezone(timezone.utc)
+        data["run_at"] = run_at
         return cls(**data)
 
     def to_dict(self) -> Dict[str, Any]:
-        data = self.__dict__.copy()
-        data["run_at"] = self.run_at.isoformat()
+        data = {name: getattr(self, name) for name in _SERIALISED_FIELDS}
+        data["run_at"] = self._iso_run_at
         return data
 
 
+_SERIALISED_FIELDS = tuple(item.name for item in fields(ScheduledJob) if item.init)
+
+
+def _iter_raw_jobs(handle: BinaryIO) -> Iterable[Dict[str, Any]]:
+    try:
+        # Optional dependency: stream one job at a time instead of materialising
+        # the whole schedules file before building ScheduledJob objects.
+        import ijson
+    except ImportError:
+        return json.load(handle)
+    return ijson.items(handle, "item")
+
+
+def _run_at_key(job: ScheduledJob) -> float:
+    return job._run_at_epoch
+
+
 class ScheduleManager:
+    """Persisted collection of scheduled jobs.
+
+    Pending jobs live in a min-heap keyed by their UTC epoch so the scheduler
+    loop only touches jobs that are actually due.
+    """
+
     def __init__(self, config: BotConfig):
         self._config = config
         self._path = config.schedule_path
-        self._jobs: list[ScheduledJob] = []
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._heap: list[tuple[float, int, ScheduledJob]] = []
+        self._jobs_by_id: dict[str, ScheduledJob] = {}
+        self._sequence = itertools.count()
+        self._jobs_view: tuple[ScheduledJob, ...] | None = None
+        self._dirty = False
+        self._save_handle: asyncio.TimerHandle | None = None
+        self._save_task: asyncio.Task[None] | None = None
+        self._version = 0
+        self._written_version = 0
+        self._write_lock = threading.Lock()
 
     @property
-    def jobs(self) -> list[ScheduledJob]:
-        return list(self._jobs)
+    def jobs(self) -> tuple[ScheduledJob, ...]:
+        """Read-only snapshot of the pending jobs, rebuilt only after changes."""
+
+        if self._jobs_view is None:
+            self._jobs_view = tuple(sorted(self._jobs_by_id.values(), key=_run_at_key))
+        return self._jobs_view
 
     def load(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._set_jobs([])
         if not self._path.exists():
             logger.info("No schedules file found at %s; starting fresh", self._path)
-            self._jobs = []
             return
         try:
-            with self._path.open("r", encoding="utf-8") as handle:
-                raw_jobs = json.load(handle)
+            with self._path.open("rb", buffering=64 * 1024) as handle:
+                jobs = [ScheduledJob.from_dict(job) for job in _iter_raw_jobs(handle)]
         except Exception as exc:
             logger.error("Failed to load schedules: %s", exc)
-            self._jobs = []
             return
-        self._jobs = [ScheduledJob.from_dict(job) for job in raw_jobs]
-        logger.info("Loaded %d scheduled jobs", len(self._jobs))
+        self._set_jobs(jobs)
+        logger.info("Loaded %d scheduled jobs", len(self._jobs_by_id))
+
+    def _set_jobs(self, jobs: Iterable[ScheduledJob]) -> None:
+        self._jobs_by_id = {job.id: job for job in jobs}
+        self._heap = [self._heap_entry(job) for job in self._jobs_by_id.values()]
+        heapq.heapify(self._heap)
+        self._jobs_view = None
+
+    def _heap_entry(self, job: ScheduledJob) -> tuple[float, int, ScheduledJob]:
+        return job._run_at_epoch, next(self._sequence), job
 
     def save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
+        version = self._version
         try:
-            with self._path.open("w", encoding="utf-8") as handle:
-                json.dump([job.to_dict() for job in self._jobs], handle, ensure_ascii=False, indent=2)
+            self._write(self._serialise(), version)
         except Exception as exc:
             logger.error("Failed to save schedules: %s", exc)
+            return
+        self._dirty = False
+
+    def _serialise(self) -> str:
+        return json.dumps([job.to_dict() for job in self.jobs], ensure_ascii=False, indent=2)
+
+    def _write(self, payload: str, version: int) -> None:
+        # Write to a sibling file and atomically swap it in so a crash mid-write
+        # never leaves a truncated schedules file behind. Writes may race between
+        # the background saver and a shutdown flush; never let an older snapshot
+        # replace a newer one.
+        with self._write_lock:
+            if version < self._written_version:
+                return
+            tmp_path = self._path.with_name(self._path.name + ".tmp")
+            with tmp_path.open("w", encoding="utf-8") as handle:
+                handle.write(payload)
+            os.replace(tmp_path, self._path)
+            self._written_version = version
+
+    async def _save_async(self) -> None:
+        self._dirty = False
+        version = self._version
+        try:
+            payload = self._serialise()
+            await asyncio.to_thread(self._write, payload, version)
+        except Exception as exc:
+            logger.error("Failed to save schedules: %s", exc)
+            self._dirty = True
+        finally:
+            self._save_task = None
+
+    def flush(self) -> None:
+        """Write pending changes immediately, e.g. during shutdown."""
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._dirty:
+            self.save()
+
+    def _schedule_save(self) -> None:
+        # Coalesce bursts of mutations into a single rewrite of the schedules
+        # file. Outside of a running event loop (start-up, scripts) there is
+        # nothing to debounce against, so persist straight away.
+        self._dirty = True
+        self._version += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.save()
+            return
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(SAVE_DEBOUNCE_SECONDS, self._flush_save)
+
+    def _flush_save(self) -> None:
+        self._save_handle = None
+        if not self._dirty:
+            return
+        loop = asyncio.get_running_loop()
+        if self._save_task is not None:
+            # A write is still in flight; try again once it has had time to land.
+            self._save_handle = loop.call_later(SAVE_DEBOUNCE_SECONDS, self._flush_save)
+            return
+        self._save_task = loop.create_task(self._save_async())
 
     def add_job(self, job: ScheduledJob) -> None:
-        self._jobs.append(job)
-        self.save()
+        self._jobs_by_id[job.id] = job
+        heapq.heappush(self._heap, self._heap_entry(job))
+        self._jobs_view = None
+        self._schedule_save()
 
     def remove_job(self, job_id: str) -> bool:
-        before = len(self._jobs)
-        self._jobs = [job for job in self._jobs if job.id != job_id]
-        if len(self._jobs) < before:
-            self.save()
-            return True
-        return False
+        job = self._jobs_by_id.pop(job_id, None)
+        if job is None:
+            return False
+        # The heap entry is left behind and skipped by due_jobs; only compact
+        # once stale entries outnumber live ones so removal stays O(1).
+        if len(self._heap) > 2 * len(self._jobs_by_id):
+            self._heap = [
+                entry for entry in self._heap if self._jobs_by_id.get(entry[2].id) is entry[2]
+            ]
+            heapq.heapify(self._heap)
+        self._jobs_view = None
+        self._schedule_save()
+        return True
 
     def due_jobs(self, now: datetime) -> Iterable[ScheduledJob]:
-        due, remaining = [], []
-        for job in self._jobs:
-            if job.run_at <= now:
-                due.append(job)
-            else:
-                remaining.append(job)
+        now_ts = now.timestamp()
+        due = []
+        while self._heap and self._heap[0][0] <= now_ts:
+            _, _, job = heapq.heappop(self._heap)
+            if self._jobs_by_id.get(job.id) is not job:
+                continue
+            del self._jobs_by_id[job.id]
+            due.append(job)
         if due:
-            self._jobs = remaining
-            self.save()
+            self._jobs_view = None
+            self._schedule_save()
         return due
 
 
 WHEN_FORMAT = "%d.%m.%Y %H:%M"
 DURATION_RE = re.compile(r"(\d+)\s*([hdw])")
+DURATION_UNIT_HOURS = {"h": 1, "d": 24, "w": 7 * 24}
 
 
-def parse_when(value: str, tz: pytz.BaseTzInfo) -> datetime:
+def parse_when(value: str, tz: tzinfo) -> datetime:
     dt = datetime.strptime(value, WHEN_FORMAT)
-    localized = tz.localize(dt)
-    return localized.astimezone(pytz.utc)
+    # pytz zones still need localize() to pick the right offset.
+    localize = getattr(tz, "localize", None)
+    localized = localize(dt) if localize is not None else dt.replace(tzinfo=tz)
+    return localized.astimezone(timezone.utc)
 
 
 def parse_duration(value: Optional[str], config: BotConfig) -> Optional[int]:
@@ -120,20 +265,23 @@ def parse_duration(value: Optional[str], config: BotConfig) -> Optional[int]:
         return None
     total_hours = 0
     for amount, unit in tokens:
-        hours = int(amount)
-        if unit == "h":
-            total_hours += hours
-        elif unit == "d":
-            total_hours += hours * 24
-        elif unit == "w":
-            total_hours += hours * 7 * 24
+        total_hours += int(amount) * DURATION_UNIT_HOURS[unit]
+        if total_hours >= config.max_poll_hours:
+            total_hours = config.max_poll_hours
+            break
     if total_hours <= 0:
         return None
-    if total_hours > config.max_poll_hours:
-        total_hours = config.max_poll_hours
     return total_hours * 3600
 
 
+@lru_cache(maxsize=256)
+def _resolve_emoji(value: str) -> discord.PartialEmoji | str:
+    try:
+        return discord.PartialEmoji.from_str(value)
+    except Exception:
+        return value
+
+
 def build_poll(job: ScheduledJob) -> discord.Poll:
     if not job.duration_s:
         raise ValueError("Poll jobs must define a duration")
@@ -144,13 +292,14 @@ def build_poll(job: ScheduledJob) -> discord.Poll:
     )
     if not job.options:
         return poll
-    for index, option in enumerate(job.options):
-        kwargs: dict[str, Any] = {"text": option}
-        if job.emojis and index < len(job.emojis) and job.emojis[index]:
-            emoji_value = job.emojis[index]
-            try:
-                kwargs["emoji"] = discord.PartialEmoji.from_str(emoji_value)
-            except Exception:
-                kwargs["emoji"] = emoji_value
-        poll.add_answer(**kwargs)
+    # discord.Poll has no constructor argument for answers, so resolve every
+    # emoji up front (cached across polls) and keep the per-answer path to a
+    # plain add_answer call.
+    emojis = job.emojis or []
+    resolved = [
+        _resolve_emoji(emojis[index]) if index < len(emojis) and emojis[index] else None
+        for index in range(len(job.options))
+    ]
+    for option, emoji in zip(job.options, resolved):
+        poll.add_answer(text=option, emoji=emoji)
     return poll
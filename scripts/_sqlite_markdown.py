@@ -3,31 +3,263 @@
 
 from __future__ import annotations
 
+import os
 import sqlite3
-from typing import Callable, Iterable
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Callable, Generator, Iterable, Iterator, Mapping, Sequence, TextIO
 
 ValueFormatter = Callable[[str, object], str]
+CellFormatter = Callable[[object], str]
 
+# Rows are pulled from SQLite in batches of this size so that large tables never
+# have to be held in memory all at once.
+FETCH_BATCH_SIZE = 1000
 
-def iter_tables(conn: sqlite3.Connection) -> Iterable[str]:
-    """Yield the non-internal table names in the database, sorted alphabetically."""
+# Blobs longer than this are summarised by size instead of dumped as hex.
+MAX_BLOB_HEX = 64
+
+# Dumps are one-off full scans: forbid writes, memory-map up to 256 MiB of the
+# file and give SQLite a 64 MiB page cache instead of the 2 MiB default.
+_READ_PRAGMAS = (
+    "PRAGMA query_only = 1",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def configure_for_dump(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Tune ``conn`` for a read-only sequential dump and return it."""
+
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+_SHARED_CONNECTIONS: dict[Path, sqlite3.Connection] = {}
+
+
+def _connect_readonly(path: Path, *, shared: bool = False) -> sqlite3.Connection:
+    uri = f"{path.resolve().as_uri()}?mode=ro"
+    if shared:
+        uri += "&cache=shared"
+    return configure_for_dump(sqlite3.connect(uri, uri=True, check_same_thread=False))
+
+
+def open_readonly(path: Path) -> sqlite3.Connection:
+    """Open ``path`` read-only and tuned for dumping.
+
+    With ``LEO_SQLITE_SHARED=1`` the connection uses SQLite's shared cache and
+    is kept open for later calls with the same path in this process, so running
+    several dumps back to back reuses a warm page cache. Release connections
+    with :func:`close_readonly`, which leaves shared ones open.
+    """
+
+    if os.environ.get("LEO_SQLITE_SHARED") != "1":
+        return _connect_readonly(path)
+    key = path.resolve()
+    conn = _SHARED_CONNECTIONS.get(key)
+    if conn is None:
+        conn = _SHARED_CONNECTIONS[key] = _connect_readonly(key, shared=True)
+    return conn
+
+
+def close_readonly(conn: sqlite3.Connection) -> None:
+    """Close a connection from :func:`open_readonly` unless it is being shared."""
+
+    if conn not in _SHARED_CONNECTIONS.values():
+        conn.close()
+
+
+def iter_tables(conn: sqlite3.Connection) -> tuple[str, ...]:
+    """Return the non-internal table names in the database, sorted alphabetically."""
 
     cursor = conn.execute(
         "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
     )
-    return (row[0] for row in cursor.fetchall())
+    return tuple(row[0] for row in cursor)
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+# SQLite caps compound SELECTs at 500 terms by default.
+_MAX_COMPOUND_TERMS = 500
+
+
+def populated_tables(conn: sqlite3.Connection, tables: Sequence[str]) -> frozenset[str]:
+    """Return the subset of ``tables`` holding at least one row.
+
+    All tables are probed with ``EXISTS`` in a single ``UNION ALL`` query (per
+    500 tables), so empty ones never need a ``SELECT *`` of their own.
+    """
+
+    populated: set[str] = set()
+    for start in range(0, len(tables), _MAX_COMPOUND_TERMS):
+        chunk = tables[start : start + _MAX_COMPOUND_TERMS]
+        query = " UNION ALL ".join(
+            f"SELECT ? WHERE EXISTS (SELECT 1 FROM {_quote_identifier(table)})"
+            for table in chunk
+        )
+        populated.update(row[0] for row in conn.execute(query, chunk))
+    return frozenset(populated)
+
+
+# Pipes would split a cell and newlines would end the table row early.
+_MD_ESCAPE = str.maketrans({"|": "\\|", "\n": " ", "\r": " "})
+
+
+def _format_none(value: None) -> str:
+    return ""
+
+
+def _format_bytes(value: bytes | bytearray) -> str:
+    size = len(value)
+    if not size:
+        return ""
+    if size > MAX_BLOB_HEX:
+        # Like the Toto HTML placeholder: large blobs would only bloat the dump.
+        return f"<blob {size} bytes>"
+    return value.hex()
+
+
+def _format_str(value: str) -> str:
+    return value.translate(_MD_ESCAPE)
+
+
+def _format_float(value: float) -> str:
+    # Whole numbers (the common case for odds and amounts) skip the padded
+    # fixed-point string; zero stays on the slow path to keep "-0" intact.
+    if value and value.is_integer():
+        return str(int(value))
+    return f"{value:.6f}".rstrip("0").rstrip(".")
+
+
+# SQLite only ever hands back exact builtin types, so a lookup on type(value)
+# replaces the isinstance chain; anything unlisted (such as int) goes through str().
+_FORMATTERS_BY_TYPE: dict[type, Callable[[Any], str]] = {
+    type(None): _format_none,
+    bytes: _format_bytes,
+    bytearray: _format_bytes,
+    float: _format_float,
+    str: _format_str,
+}
+
+
+def format_cell(value: object) -> str:
+    """Format a database value for Markdown regardless of its column."""
+
+    format_by_type = _FORMATTERS_BY_TYPE.get(type(value))
+    if format_by_type is None:
+        return str(value)
+    return format_by_type(value)
 
 
 def default_format_value(column: str, value: object) -> str:
     """Format a database value for presentation in Markdown."""
 
-    if value is None:
-        return ""
-    if isinstance(value, (bytes, bytearray)):
-        return value.hex()
-    if isinstance(value, float):
-        return f"{value:.6f}".rstrip("0").rstrip(".")
-    return str(value)
+    return format_cell(value)
+
+
+def make_row_formatter(
+    columns: Sequence[str],
+    formatter: ValueFormatter = default_format_value,
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+) -> tuple[CellFormatter, ...]:
+    """Return one single-argument formatter per column of a table.
+
+    Columns listed in ``column_formatters`` use that function directly; the rest
+    bind their name to ``formatter`` once so the row loop never re-checks it.
+    """
+
+    overrides = column_formatters or {}
+    if formatter is default_format_value:
+        return tuple(overrides.get(column, format_cell) for column in columns)
+    return tuple(overrides.get(column) or partial(formatter, column) for column in columns)
+
+
+def _select_statement(
+    conn: sqlite3.Connection,
+    table: str,
+    projection_overrides: Mapping[str, str] | None,
+) -> str:
+    if not projection_overrides:
+        return f"SELECT * FROM {table}"
+    table_info = conn.execute(f"PRAGMA table_info({_quote_identifier(table)})")
+    columns = [row[1] for row in table_info]
+    if projection_overrides.keys().isdisjoint(columns):
+        return f"SELECT * FROM {table}"
+    projection = ", ".join(
+        f"{projection_overrides[column]} AS {_quote_identifier(column)}"
+        if column in projection_overrides
+        else _quote_identifier(column)
+        for column in columns
+    )
+    return f"SELECT {projection} FROM {table}"
+
+
+@lru_cache(maxsize=64)
+def _row_layout(column_count: int) -> tuple[str, str]:
+    """Return the separator line and row template for a table of this width."""
+
+    separator = "| " + " | ".join(("---",) * column_count) + " |"
+    row_template = "| " + " | ".join(("{}",) * column_count) + " |"
+    return separator, row_template
+
+
+def _empty_table_lines(table: str) -> Iterator[str]:
+    yield f"## {table}"
+    yield ""
+    yield "_No rows._"
+    yield ""
+
+
+def dump_table_lines(
+    conn: sqlite3.Connection,
+    table: str,
+    *,
+    formatter: ValueFormatter = default_format_value,
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+    projection_overrides: Mapping[str, str] | None = None,
+) -> Iterator[str]:
+    """Yield the Markdown lines for the given table, one row at a time.
+
+    ``projection_overrides`` maps column names to SQL expressions selected in
+    their place, so bulky values can be summarised inside SQLite instead of
+    being copied into Python only to be discarded.
+    """
+
+    cursor = conn.execute(_select_statement(conn, table, projection_overrides))
+    batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+    if not batch:
+        yield from _empty_table_lines(table)
+        return
+    yield f"## {table}"
+    yield ""
+
+    # Column names come from the cursor so plain tuple rows work; the dump
+    # scripts leave row_factory unset to avoid a wrapper object per row.
+    columns = tuple(description[0] for description in cursor.description)
+    separator, row_template = _row_layout(len(columns))
+    cell_formatters = make_row_formatter(columns, formatter, column_formatters)
+
+    yield f"| {' | '.join(columns)} |"
+    yield separator
+    while batch:
+        # Format the batch a column at a time: map() drives each column's
+        # formatter from C, and rows are only stitched back together at the end.
+        formatted_columns = [
+            map(format_value, values) for format_value, values in zip(cell_formatters, zip(*batch))
+        ]
+        for cells in zip(*formatted_columns):
+            yield row_template.format(*cells)
+        batch = cursor.fetchmany(FETCH_BATCH_SIZE)
+    yield ""
 
 
 def dump_table(
@@ -35,31 +267,138 @@ def dump_table(
     table: str,
     *,
     formatter: ValueFormatter = default_format_value,
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+    projection_overrides: Mapping[str, str] | None = None,
 ) -> str:
     """Return the given table formatted as a Markdown table."""
 
-    cursor = conn.execute(f"SELECT * FROM {table}")
-    rows = cursor.fetchall()
-    if not rows:
-        return f"## {table}\n\n_No rows._\n"
+    return "\n".join(
+        dump_table_lines(
+            conn,
+            table,
+            formatter=formatter,
+            column_formatters=column_formatters,
+            projection_overrides=projection_overrides,
+        )
+    )
 
-    columns = rows[0].keys()
-    header = " | ".join(columns)
-    separator = " | ".join(["---"] * len(columns))
 
-    lines = [f"## {table}", "", f"| {header} |", f"| {separator} |"]
-    for row in rows:
-        formatted = [formatter(column, row[column]) for column in columns]
-        lines.append(f"| {' | '.join(formatted)} |")
-    lines.append("")
-    return "\n".join(lines)
+def dump_all_tables(
+    conn: sqlite3.Connection,
+    *,
+    formatter: ValueFormatter = default_format_value,
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+    projection_overrides: Mapping[str, str] | None = None,
+    tables: tuple[str, ...] | None = None,
+) -> Iterator[str]:
+    """Dump every table in the database using the provided formatter.
 
+    Pass ``tables`` (as returned by :func:`iter_tables`) to skip re-reading the
+    schema when the caller already has the table list.
+    """
 
-def dump_all_tables(
+    if tables is None:
+        tables = iter_tables(conn)
+    for table in tables:
+        yield dump_table(
+            conn,
+            table,
+            formatter=formatter,
+            column_formatters=column_formatters,
+            projection_overrides=projection_overrides,
+        )
+
+
+def dump_tables_parallel(
+    db_path: Path,
+    tables: Iterable[str],
+    *,
+    formatter: ValueFormatter = default_format_value,
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+    projection_overrides: Mapping[str, str] | None = None,
+    jobs: int,
+) -> Generator[str, None, None]:
+    """Render tables on ``jobs`` threads, yielding them in the order given.
+
+    Each worker opens its own read-only connection because SQLite connections
+    cannot be shared between threads; queries then overlap since sqlite3
+    releases the GIL while stepping statements.
+    """
+
+    local = threading.local()
+    connections: list[sqlite3.Connection] = []
+    connections_lock = threading.Lock()
+
+    def render(table: str) -> str:
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = _connect_readonly(db_path)
+            local.conn = conn
+            with connections_lock:
+                connections.append(conn)
+        return dump_table(
+            conn,
+            table,
+            formatter=formatter,
+            column_formatters=column_formatters,
+            projection_overrides=projection_overrides,
+        )
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            yield from pool.map(render, tables)
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+def print_tables(
     conn: sqlite3.Connection,
+    db_path: Path,
     *,
     formatter: ValueFormatter = default_format_value,
-) -> list[str]:
-    """Dump every table in the database using the provided formatter."""
+    column_formatters: Mapping[str, CellFormatter] | None = None,
+    projection_overrides: Mapping[str, str] | None = None,
+    jobs: int = 1,
+    out: TextIO | None = None,
+) -> bool:
+    """Print every table as Markdown and return whether any table was found."""
 
-    return [dump_table(conn, table, formatter=formatter) for table in iter_tables(conn)]
+    if out is None:
+        out = sys.stdout
+    tables = iter_tables(conn)
+    populated = populated_tables(conn, tables)
+    if jobs > 1:
+        rendered_tables = dump_tables_parallel(
+            db_path,
+            [table for table in tables if table in populated],
+            formatter=formatter,
+            column_formatters=column_formatters,
+            projection_overrides=projection_overrides,
+            jobs=jobs,
+        )
+        try:
+            for table in tables:
+                if table in populated:
+                    out.write(next(rendered_tables) + "\n")
+                else:
+                    out.writelines(f"{line}\n" for line in _empty_table_lines(table))
+        finally:
+            rendered_tables.close()
+    else:
+        for table in tables:
+            if table not in populated:
+                out.writelines(f"{line}\n" for line in _empty_table_lines(table))
+                continue
+            # A single writelines call per table streams the rows without the
+            # per-line overhead of print().
+            lines = dump_table_lines(
+                conn,
+                table,
+                formatter=formatter,
+                column_formatters=column_formatters,
+                projection_overrides=projection_overrides,
+            )
+            out.writelines(f"{line}\n" for line in lines)
+    out.flush()
+    return bool(tables)
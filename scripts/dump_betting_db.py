@@ -10,9 +10,21 @@ from pathlib import Path
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parent))
-    from _sqlite_markdown import default_format_value, dump_all_tables
+    from _sqlite_markdown import (
+        close_readonly,
+        default_format_value,
+        format_cell,
+        open_readonly,
+        print_tables,
+    )
 else:  # pragma: no cover - executed when invoked as a module
-    from ._sqlite_markdown import default_format_value, dump_all_tables
+    from ._sqlite_markdown import (
+        close_readonly,
+        default_format_value,
+        format_cell,
+        open_readonly,
+        print_tables,
+    )
 
 TOKEN_MULTIPLIER = 100
 MONETARY_COLUMNS: frozenset[str] = frozenset({"amount", "balance", "balance_after", "payout"})
@@ -24,12 +36,23 @@ def from_cents(amount: int) -> float:
     return amount / TOKEN_MULTIPLIER
 
 
-def format_value(column: str, value: object) -> str:
-    if isinstance(value, int) and column in MONETARY_COLUMNS:
+def format_monetary(value: object) -> str:
+    if type(value) is int:
         return f"{from_cents(value):.2f} ({value})"
+    return format_cell(value)
+
+
+def format_value(column: str, value: object) -> str:
+    if column in MONETARY_COLUMNS:
+        return format_monetary(value)
     return default_format_value(column, value)
 
 
+# Monetary columns are known by name, so the dump resolves them once per table
+# instead of testing every cell against MONETARY_COLUMNS.
+COLUMN_FORMATTERS = {column: format_monetary for column in MONETARY_COLUMNS}
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument(
@@ -38,24 +61,27 @@ def main() -> int:
         default=Path("wallet.sqlite"),
         help="Path to the wallet sqlite database (default: wallet.sqlite)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render tables on this many threads (default: 1)",
+    )
     args = parser.parse_args()
 
-    if not args.db.exists():
-        raise SystemExit(f"Database not found: {args.db}")
-
-    conn = sqlite3.connect(args.db)
-    conn.row_factory = sqlite3.Row
+    try:
+        conn = open_readonly(args.db)
+    except sqlite3.OperationalError as exc:
+        raise SystemExit(f"Database not found or unreadable: {args.db} ({exc})") from exc
 
     try:
-        tables = dump_all_tables(conn, formatter=format_value)
-        if not tables:
+        if not print_tables(
+            conn, args.db, column_formatters=COLUMN_FORMATTERS, jobs=args.jobs
+        ):
             print("No tables found.")
-            return 0
-        for table in tables:
-            print(table)
         return 0
     finally:
-        conn.close()
+        close_readonly(conn)
 
 
 if __name__ == "__main__":
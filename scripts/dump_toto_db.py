@@ -10,20 +10,26 @@ from pathlib import Path
 
 if __package__ is None or __package__ == "":
     sys.path.append(str(Path(__file__).resolve().parent))
-    from _sqlite_markdown import default_format_value, dump_all_tables
+    from _sqlite_markdown import close_readonly, open_readonly, print_tables
 else:  # pragma: no cover - executed when invoked as a module
-    from ._sqlite_markdown import default_format_value, dump_all_tables
+    from ._sqlite_markdown import close_readonly, open_readonly, print_tables
 
 
-def _toto_formatter(column: str, value: object) -> str:
-    """Format Toto DB values, trimming large HTML blobs."""
-
-    if column == "html" and isinstance(value, str):
-        # The Toto snapshots table stores the raw fetched markup, which quickly
-        # becomes unwieldy in a Markdown dump. Replace the body with a compact
-        # placeholder that still advertises how much HTML was captured.
-        return f"<html {len(value)} chars>"
-    return default_format_value(column, value)
+# The Toto snapshots table stores the raw fetched markup (zlib-compressed in
+# ``html_z`` for newer snapshots), which quickly becomes unwieldy in a Markdown
+# dump. Replace the body with a compact placeholder that still advertises how
+# much HTML was captured, computed inside SQLite so the markup itself is never
+# copied into Python.
+PROJECTION_OVERRIDES = {
+    "html": (
+        "CASE WHEN typeof(html) = 'text' "
+        "THEN '<html ' || length(html) || ' chars>' ELSE html END"
+    ),
+    "html_z": (
+        "CASE WHEN typeof(html_z) = 'blob' "
+        "THEN '<zlib html ' || length(html_z) || ' bytes>' ELSE html_z END"
+    ),
+}
 
 
 def main() -> int:
@@ -34,24 +40,27 @@ def main() -> int:
         default=Path("toto_f1.sqlite"),
         help="Path to the Toto F1 sqlite database (default: toto_f1.sqlite)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Render tables on this many threads (default: 1)",
+    )
     args = parser.parse_args()
 
-    if not args.db.exists():
-        raise SystemExit(f"Database not found: {args.db}")
-
-    conn = sqlite3.connect(args.db)
-    conn.row_factory = sqlite3.Row
+    try:
+        conn = open_readonly(args.db)
+    except sqlite3.OperationalError as exc:
+        raise SystemExit(f"Database not found or unreadable: {args.db} ({exc})") from exc
 
     try:
-        tables = dump_all_tables(conn, formatter=_toto_formatter)
-        if not tables:
+        if not print_tables(
+            conn, args.db, projection_overrides=PROJECTION_OVERRIDES, jobs=args.jobs
+        ):
             print("No tables found.")
-            return 0
-        for table in tables:
-            print(table)
         return 0
     finally:
-        conn.close()
+        close_readonly(conn)
 
 
 if __name__ == "__main__":
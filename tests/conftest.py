@@ -0,0 +1,45 @@
+"""Shared module loading for the test suite.
+
+The bot package imports discord, FastF1 and friends from ``leo_bot/__init__``,
+so tests load the submodules they need straight from their source files under
+stub ``leo_bot`` packages. Loading goes through :func:`import_repo_module`,
+which executes each file once per session and hands back the cached module to
+every later test file.
+"""
+
+from pathlib import Path
+import importlib.util
+import sys
+from types import ModuleType
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _ensure_package(name: str, relative_dir: str) -> None:
+    if name not in sys.modules:
+        package = ModuleType(name)
+        package.__path__ = [str(REPO_ROOT / relative_dir)]
+        sys.modules[name] = package
+
+
+_ensure_package("leo_bot", "leo_bot")
+_ensure_package("leo_bot.cogs", "leo_bot/cogs")
+
+
+def import_repo_module(module_name: str, relative_path: str) -> ModuleType:
+    """Return ``relative_path`` loaded as ``module_name``, executing it at most once."""
+
+    path = REPO_ROOT / relative_path
+    module = sys.modules.get(module_name)
+    if module is not None and getattr(module, "__file__", None) == str(path):
+        return module
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    assert spec.loader is not None
+    spec.loader.exec_module(module)
+    return module
@@ -1,27 +1,16 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 import sys
 from types import ModuleType, SimpleNamespace
 from unittest.mock import AsyncMock
-import importlib.util
 
 import pytest
 import pytz
 
-
-REPO_ROOT = Path(__file__).resolve().parents[1]
-
-
-def _import_module(module_name: str, relative_path: str) -> ModuleType:
-    spec = importlib.util.spec_from_file_location(module_name, REPO_ROOT / relative_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[module_name] = module
-    assert spec.loader is not None
-    spec.loader.exec_module(module)
-    return module
+from conftest import import_repo_module
 
 
 if "discord" not in sys.modules:
@@ -44,18 +33,8 @@ else:
     )
 
 
-if "leo_bot" not in sys.modules:
-    pkg = ModuleType("leo_bot")
-    pkg.__path__ = [str(REPO_ROOT / "leo_bot")]
-    sys.modules["leo_bot"] = pkg
-if "leo_bot.cogs" not in sys.modules:
-    subpkg = ModuleType("leo_bot.cogs")
-    subpkg.__path__ = [str(REPO_ROOT / "leo_bot" / "cogs")]
-    sys.modules["leo_bot.cogs"] = subpkg
-
-
-config_module = _import_module("leo_bot.config", "leo_bot/config.py")
-f1_clock_module = _import_module("leo_bot.cogs.f1_clock", "leo_bot/cogs/f1_clock.py")
+config_module = import_repo_module("leo_bot.config", "leo_bot/config.py")
+f1_clock_module = import_repo_module("leo_bot.cogs.f1_clock", "leo_bot/cogs/f1_clock.py")
 
 
 BotConfig = config_module.BotConfig
@@ -205,3 +184,44 @@ async def test_schedule_channel_rename_skips_duplicate_pending_targets():
 
     assert 42 not in cog._rename_tasks
 
+
+@pytest.mark.asyncio
+async def test_update_channels_skips_names_already_applied(monkeypatch):
+    config = make_config()
+
+    channels = {
+        11: DummyGuildChannel(11, "old-event"),
+        12: DummyGuildChannel(12, "old-date"),
+        13: DummyGuildChannel(13, "old-countdown"),
+    }
+    lookups = []
+
+    class Bot(SimpleNamespace):
+        def get_channel(self, channel_id: int):
+            lookups.append(channel_id)
+            return channels.get(channel_id)
+
+    cog = F1ClockCog(Bot(), config)
+    countdown = iter(["Countdown 1", "Countdown 2"])
+
+    monkeypatch.setattr(
+        f1_clock_module,
+        "find_next_session",
+        lambda tz: ({"EventName": "Race"}, "Q", datetime.now(timezone.utc)),
+    )
+    monkeypatch.setattr(
+        f1_clock_module,
+        "format_session_channel_strings",
+        lambda event, code, dt, tz: ("Event", "Date", "Time", next(countdown)),
+    )
+
+    await cog.update_channels()
+    await asyncio.gather(*(task for _, task in cog._rename_tasks.values()))
+    lookups.clear()
+
+    await cog.update_channels()
+    await asyncio.gather(*(task for _, task in cog._rename_tasks.values()))
+
+    assert lookups == [13]
+    channels[11].edit.assert_awaited_once()
+    assert channels[13].edit.await_count == 2
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+import sys
+from types import ModuleType, SimpleNamespace
+
+import pytest
+import pytz
+
+from conftest import import_repo_module
+
+pd = pytest.importorskip("pandas")
+
+
+if "fastf1" not in sys.modules:
+    fastf1_stub = ModuleType("fastf1")
+    fastf1_stub.Cache = SimpleNamespace(enable_cache=lambda *_: None)
+    fastf1_stub.get_event_schedule = lambda *args, **kwargs: None
+    sys.modules["fastf1"] = fastf1_stub
+
+import_repo_module("leo_bot.config", "leo_bot/config.py")
+f1_module = import_repo_module("leo_bot.f1", "leo_bot/f1.py")
+
+
+class FakeEvent(dict):
+    def __init__(self, name: str, sessions: dict[str, datetime]):
+        super().__init__(EventName=name)
+        self._sessions = sessions
+
+    def get_session_date(self, identifier: str, utc: bool = False):
+        if identifier not in self._sessions:
+            raise ValueError(identifier)
+        return self._sessions[identifier]
+
+
+class FakeSchedule(pd.DataFrame):
+    _metadata = ["events"]
+
+    def get_event_by_round(self, rnd: int) -> FakeEvent:
+        return self.events[rnd]
+
+
+def make_schedule(events: dict[int, FakeEvent]) -> FakeSchedule:
+    schedule = FakeSchedule(
+        {
+            "RoundNumber": list(events),
+            "EventName": [event["EventName"] for event in events.values()],
+        }
+    )
+    schedule.events = events
+    return schedule
+
+
+@pytest.fixture(autouse=True)
+def clear_schedule_cache():
+    f1_module._SCHEDULE_CACHE.clear()
+    yield
+    f1_module._SCHEDULE_CACHE.clear()
+
+
+def test_find_next_session_uses_cached_schedule(monkeypatch):
+    now = datetime.now(timezone.utc)
+    past = FakeEvent("Past Grand Prix", {"R": now - timedelta(days=7)})
+    upcoming = FakeEvent(
+        "Next Grand Prix",
+        {
+            "FP1": now + timedelta(days=1),
+            "Q": now + timedelta(days=2),
+            "R": now + timedelta(days=3),
+        },
+    )
+    schedule = make_schedule({1: past, 2: upcoming})
+    calls = []
+
+    def get_event_schedule(year, include_testing=False):
+        calls.append(year)
+        return schedule
+
+    monkeypatch.setattr(f1_module.fastf1, "get_event_schedule", get_event_schedule)
+
+    event, code, session_dt = f1_module.find_next_session(pytz.utc)
+    race_event, race_dt = f1_module.find_next_race(pytz.utc)
+
+    assert event is upcoming
+    assert code == "FP1"
+    assert session_dt == now + timedelta(days=1)
+    assert race_event is upcoming
+    assert race_dt == now + timedelta(days=3)
+    assert calls == [now.year]
+
+
+def test_testing_mask_matches_row_check():
+    schedule = pd.DataFrame(
+        {
+            "EventName": ["Pre-Season Testing", "Bahrain Grand Prix", None],
+            "EventFormat": ["testing", "conventional", "sprint_qualifying"],
+        }
+    )
+
+    mask = f1_module._testing_mask(schedule)
+
+    assert list(mask) == [
+        f1_module._is_testing_row(row) for _, row in schedule.iterrows()
+    ]
+    assert f1_module._testing_mask(pd.DataFrame({"RoundNumber": [1]})) is None
@@ -0,0 +1,50 @@
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import discord
+import pytest
+import pytz
+
+from conftest import import_repo_module
+
+
+config_module = import_repo_module("leo_bot.config", "leo_bot/config.py")
+moderation_module = import_repo_module("leo_bot.cogs.moderation", "leo_bot/cogs/moderation.py")
+
+BotConfig = config_module.BotConfig
+ModerationCog = moderation_module.ModerationCog
+
+
+def make_cog() -> ModerationCog:
+    config = BotConfig(
+        token="token",
+        guild_id=1,
+        test_guild_id=1,
+        admin_ids=(1,),
+        ready_channel_id=1,
+        report_log_channel_id=1,
+        f1_channels={},
+        schedule_path=Path("/tmp/schedules.json"),
+        default_timezone=pytz.utc,
+        link_rewrite_mode="reply",
+    )
+    bot = SimpleNamespace(tree=SimpleNamespace(add_command=Mock()), user=object())
+    return ModerationCog(bot, config)
+
+
+@pytest.mark.asyncio
+async def test_reply_mode_still_replies_when_embeds_cannot_be_suppressed():
+    forbidden = discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "Missing Permissions")
+    message = SimpleNamespace(
+        content="look https://x.com/leo/status/1",
+        channel=SimpleNamespace(id=5),
+        edit=AsyncMock(side_effect=forbidden),
+        reply=AsyncMock(),
+    )
+
+    await make_cog()._handle_domain_replacements(message)
+
+    message.edit.assert_awaited_once_with(suppress=True)
+    message.reply.assert_awaited_once()
+    assert message.reply.await_args.args == ("look https://fixupx.com/leo/status/1",)
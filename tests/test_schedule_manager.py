@@ -0,0 +1,112 @@
+import asyncio
+from datetime import datetime, timedelta
+from pathlib import Path
+import json
+
+import pytest
+import pytz
+
+from conftest import import_repo_module
+
+
+config_module = import_repo_module("leo_bot.config", "leo_bot/config.py")
+scheduler_core = import_repo_module("leo_bot.scheduler", "leo_bot/scheduler.py")
+
+BotConfig = config_module.BotConfig
+ScheduleManager = scheduler_core.ScheduleManager
+ScheduledJob = scheduler_core.ScheduledJob
+
+
+def make_manager(path: Path) -> ScheduleManager:
+    config = BotConfig(
+        token="token",
+        guild_id=1,
+        test_guild_id=1,
+        admin_ids=(1,),
+        ready_channel_id=1,
+        report_log_channel_id=1,
+        f1_channels={},
+        schedule_path=path,
+        default_timezone=pytz.utc,
+    )
+    return ScheduleManager(config)
+
+
+def make_job(job_id: str, run_at: datetime) -> ScheduledJob:
+    return ScheduledJob(
+        id=job_id,
+        kind="message",
+        guild_id=1,
+        channel_id=5,
+        run_at=run_at,
+        created_by=1,
+        content="hello",
+    )
+
+
+@pytest.mark.asyncio
+async def test_saves_are_debounced_inside_event_loop(tmp_path):
+    path = tmp_path / "schedules.json"
+    manager = make_manager(path)
+    run_at = datetime(2099, 1, 1, 10, 0, tzinfo=pytz.utc)
+
+    manager.add_job(make_job("a", run_at))
+    manager.add_job(make_job("b", run_at + timedelta(hours=1)))
+
+    assert not path.exists()
+
+    manager.flush()
+
+    with path.open(encoding="utf-8") as handle:
+        assert [job["id"] for job in json.load(handle)] == ["a", "b"]
+
+
+def test_due_jobs_returns_only_elapsed_jobs_in_run_order(tmp_path):
+    manager = make_manager(tmp_path / "schedules.json")
+    base = datetime(2099, 1, 1, 10, 0, tzinfo=pytz.utc)
+
+    manager.add_job(make_job("late", base + timedelta(hours=2)))
+    manager.add_job(make_job("early", base))
+    manager.add_job(make_job("middle", base + timedelta(hours=1)))
+
+    assert list(manager.due_jobs(base - timedelta(minutes=1))) == []
+
+    due = manager.due_jobs(base + timedelta(hours=1))
+
+    assert [job.id for job in due] == ["early", "middle"]
+    assert [job.id for job in manager.jobs] == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_debounced_save_writes_atomically_in_background(tmp_path, monkeypatch):
+    monkeypatch.setattr(scheduler_core, "SAVE_DEBOUNCE_SECONDS", 0)
+    path = tmp_path / "schedules.json"
+    manager = make_manager(path)
+
+    manager.add_job(make_job("a", datetime(2099, 1, 1, 10, 0, tzinfo=pytz.utc)))
+    for _ in range(50):
+        if path.exists():
+            break
+        await asyncio.sleep(0.01)
+
+    with path.open(encoding="utf-8") as handle:
+        assert [job["id"] for job in json.load(handle)] == ["a"]
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_removed_jobs_are_skipped_by_due_jobs(tmp_path):
+    manager = make_manager(tmp_path / "schedules.json")
+    base = datetime(2099, 1, 1, 10, 0, tzinfo=pytz.utc)
+
+    for index in range(4):
+        manager.add_job(make_job(f"job-{index}", base + timedelta(minutes=index)))
+    manager.add_job(make_job("kept", base + timedelta(hours=1)))
+
+    assert manager.remove_job("job-0")
+    assert not manager.remove_job("job-0")
+    assert manager.remove_job("job-2")
+
+    due = manager.due_jobs(base + timedelta(minutes=30))
+
+    assert [job.id for job in due] == ["job-1", "job-3"]
+    assert [job.id for job in manager.jobs] == ["kept"]
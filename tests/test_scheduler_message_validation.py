@@ -1,39 +1,16 @@
 from pathlib import Path
-import sys
-from types import ModuleType, SimpleNamespace
+from types import SimpleNamespace
 from unittest.mock import AsyncMock
-import importlib.util
 
 import pytest
 import pytz
 
+from conftest import import_repo_module
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
 
-
-def _import_module(module_name: str, relative_path: str) -> ModuleType:
-    spec = importlib.util.spec_from_file_location(
-        module_name, REPO_ROOT / relative_path
-    )
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[module_name] = module
-    assert spec.loader is not None
-    spec.loader.exec_module(module)
-    return module
-
-
-if "leo_bot" not in sys.modules:
-    pkg = ModuleType("leo_bot")
-    pkg.__path__ = [str(REPO_ROOT / "leo_bot")]
-    sys.modules["leo_bot"] = pkg
-if "leo_bot.cogs" not in sys.modules:
-    subpkg = ModuleType("leo_bot.cogs")
-    subpkg.__path__ = [str(REPO_ROOT / "leo_bot" / "cogs")]
-    sys.modules["leo_bot.cogs"] = subpkg
-
-config_module = _import_module("leo_bot.config", "leo_bot/config.py")
-scheduler_core = _import_module("leo_bot.scheduler", "leo_bot/scheduler.py")
-scheduler_module = _import_module(
+config_module = import_repo_module("leo_bot.config", "leo_bot/config.py")
+scheduler_core = import_repo_module("leo_bot.scheduler", "leo_bot/scheduler.py")
+scheduler_module = import_repo_module(
     "leo_bot.cogs.scheduler", "leo_bot/cogs/scheduler.py"
 )
 
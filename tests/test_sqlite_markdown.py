@@ -0,0 +1,95 @@
+import sqlite3
+
+import pytest
+
+from conftest import import_repo_module
+
+
+sqlite_markdown = import_repo_module("_sqlite_markdown", "scripts/_sqlite_markdown.py")
+
+
+@pytest.fixture(params=[None, sqlite3.Row], ids=["tuple", "row"])
+def conn(request):
+    connection = sqlite3.connect(":memory:")
+    connection.row_factory = request.param
+    connection.execute("CREATE TABLE items (id INTEGER, name TEXT, price REAL)")
+    connection.executemany(
+        "INSERT INTO items VALUES (?, ?, ?)",
+        [(1, "one", 1.5), (2, None, 2.0), (3, "three", 0.25)],
+    )
+    connection.execute("CREATE TABLE empty (id INTEGER)")
+    yield connection
+    connection.close()
+
+
+def test_dump_table_streams_rows_in_batches(conn, monkeypatch):
+    monkeypatch.setattr(sqlite_markdown, "FETCH_BATCH_SIZE", 2)
+
+    assert sqlite_markdown.dump_table(conn, "items") == (
+        "## items\n"
+        "\n"
+        "| id | name | price |\n"
+        "| --- | --- | --- |\n"
+        "| 1 | one | 1.5 |\n"
+        "| 2 |  | 2 |\n"
+        "| 3 | three | 0.25 |\n"
+    )
+    assert sqlite_markdown.dump_table(conn, "empty") == "## empty\n\n_No rows._\n"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(1.5, "1.5"), (0.0, "0"), (-0.0, "-0"), (1000000.0, "1000000"), (0.1234567, "0.123457")],
+)
+def test_default_format_value_renders_floats(value, expected):
+    assert sqlite_markdown.default_format_value("price", value) == expected
+
+
+def test_default_format_value_escapes_markdown_table_syntax():
+    assert sqlite_markdown.default_format_value("note", "a|b\r\nc") == "a\\|b  c"
+
+
+def test_dump_tables_parallel_preserves_table_order(tmp_path):
+    path = tmp_path / "dump.sqlite"
+    connection = sqlite3.connect(path)
+    for name in ("alpha", "beta", "gamma"):
+        connection.execute(f"CREATE TABLE {name} (value TEXT)")
+        connection.execute(f"INSERT INTO {name} VALUES (?)", (name,))
+    connection.commit()
+
+    tables = sqlite_markdown.iter_tables(connection)
+    expected = [sqlite_markdown.dump_table(connection, table) for table in tables]
+    connection.close()
+
+    assert list(sqlite_markdown.dump_tables_parallel(path, tables, jobs=3)) == expected
+
+
+def test_dump_table_uses_column_specific_formatters(conn):
+    dumped = sqlite_markdown.dump_table(
+        conn, "items", column_formatters={"price": lambda value: f"${value}"}
+    )
+
+    assert "| 1 | one | $1.5 |" in dumped.splitlines()
+
+
+def test_dump_table_applies_projection_overrides(conn):
+    dumped = sqlite_markdown.dump_table(
+        conn, "items", projection_overrides={"name": "length(name)", "missing": "1"}
+    )
+
+    assert dumped.splitlines()[2:5] == [
+        "| id | name | price |",
+        "| --- | --- | --- |",
+        "| 1 | 3 | 1.5 |",
+    ]
+
+
+def test_populated_tables_skips_empty_tables(conn):
+    assert sqlite_markdown.populated_tables(conn, ("empty", "items")) == {"items"}
+    assert sqlite_markdown.populated_tables(conn, ()) == frozenset()
+
+
+def test_default_format_value_summarises_large_blobs():
+    assert sqlite_markdown.default_format_value("raw", b"") == ""
+    assert sqlite_markdown.default_format_value("raw", b"\x00\xff") == "00ff"
+    assert sqlite_markdown.default_format_value("raw", bytes(65)) == "<blob 65 bytes>"
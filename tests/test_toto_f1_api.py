@@ -0,0 +1,302 @@
+import pytest
+
+from conftest import import_repo_module
+
+
+toto = import_repo_module("toto_f1_api", "toto_f1_api.py")
+
+
+PAGE = """<html><head><style>.x{}</style><script>var a = 1;</script></head><body>
+<div>Alles</div>
+<div>Formule 1 2025</div>
+<div>Grand Prix Race</div>
+<div>Kwalificatie</div>
+<div>Winnaar Kampioenschap - Coureurs</div>
+<div>Verstappen, Max</div><div>2,50</div>
+<div>Norris, Lando</div><div>3,25</div>
+<div>Bekijk meer</div>
+<div>Pérez, Sergio</div><div>1.001,00</div>
+<div>Winnaar Race - Grand Prix</div>
+<div>Verstappen, Max</div><div>1,80</div>
+<div>Red Bull Racing</div><div>1,50</div>
+</body></html>"""
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    client = toto.TotoF1Client(db_path=str(tmp_path / "toto.sqlite"))
+    monkeypatch.setattr(client, "_fetch_html", lambda **kwargs: PAGE)
+    yield client
+    client.close()
+
+
+def test_refresh_stores_markets_outcomes_and_entities(client):
+    snap_id = client.refresh(mode="requests")
+
+    assert [s.title for s in client.list_sections()] == [
+        "Formule 1 2025", "Grand Prix Race", "Kwalificatie",
+    ]
+    markets = client.list_markets()
+    assert [m.name for m in markets] == [
+        "Winnaar Kampioenschap - Coureurs", "Winnaar Race - Grand Prix",
+    ]
+    outcomes = client.list_outcomes(markets[0].id)
+    assert [(o.selection_name, o.odds_decimal) for o in outcomes] == [
+        ("Verstappen, Max", 2.5), ("Norris, Lando", 3.25), ("Pérez, Sergio", 1001.0),
+    ]
+    assert outcomes[0].implied_prob == pytest.approx(0.4)
+
+    max_entity = client.find_entity("verstappen max")
+    assert max_entity is not None and max_entity.type == "driver"
+    assert client.find_entity("Red Bull Racing").type == "team"
+    history = client.entity_odds_history(max_entity.id)
+    assert [(h["market_name"], h["snapshot_id"]) for h in history] == [
+        ("Winnaar Kampioenschap - Coureurs", snap_id),
+        ("Winnaar Race - Grand Prix", snap_id),
+    ]
+
+
+def test_refresh_rolls_back_when_ingestion_fails(client, monkeypatch):
+    def boom(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(client.db, "upsert_market", boom)
+
+    with pytest.raises(RuntimeError):
+        client.refresh(mode="requests")
+
+    assert client.list_sections() == []
+    assert client.db.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 0
+
+
+def test_canonical_key_folds_case_punctuation_and_spacing():
+    assert toto.canonical_key("  Verstappen,\xa0Max ") == "verstappen max"
+    assert toto.canonical_key("Pérez, Sergio") == "prez sergio"
+
+
+def test_db_applies_connection_pragmas(tmp_path):
+    db = toto.DB(str(tmp_path / "toto.sqlite"))
+    strict = toto.DB(str(tmp_path / "strict.sqlite"), synchronous="full")
+    try:
+        assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert db.conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+        assert db.conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+        assert strict.conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    finally:
+        db.close()
+        strict.close()
+
+    with pytest.raises(ValueError):
+        toto.DB(str(tmp_path / "bad.sqlite"), synchronous="sometimes")
+
+
+def test_repeated_refresh_reuses_rows_and_bumps_last_seen(client, monkeypatch):
+    first = client.refresh(mode="requests")
+    monkeypatch.setattr(client, "_fetch_html", lambda **kwargs: PAGE.replace("2,50", "2,75"))
+    second = client.refresh(mode="requests")
+
+    markets = client.list_markets()
+    assert len(markets) == 2
+    assert {m.event_id for m in markets} == {e.id for e in client.list_events()}
+    last_seen = client.db.conn.execute("SELECT DISTINCT last_seen_snapshot_id FROM markets").fetchall()
+    assert [r[0] for r in last_seen] == [second]
+
+    entity = client.find_entity("Verstappen, Max")
+    assert client.entity_aliases(entity.id) == [("Verstappen, Max", first, second)]
+    assert client.db.conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0] == 4
+
+
+def test_insert_outcomes_returns_ids_in_selection_order(tmp_path):
+    db = toto.DB(str(tmp_path / "toto.sqlite"))
+    try:
+        snap = db.new_snapshot("https://example.invalid", "<html></html>")
+        market = db.upsert_market("Winnaar", None, snap)
+        other = db.upsert_market("Podium", None, snap)
+        db.insert_outcomes(other, [("Other", 9.0)], snap)
+
+        ids = db.insert_outcomes(market, [("A", 2.0), ("B", 4.0)], snap)
+
+        assert [(o.id, o.selection_name, o.implied_prob) for o in db.list_outcomes(market)] == [
+            (ids[0], "A", 0.5), (ids[1], "B", 0.25),
+        ]
+        assert db.insert_outcomes(market, [], snap) == []
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize(
+    ("line", "expected"),
+    [
+        ("Winnaar Race - Grand Prix", True),
+        ("  Top 3\xa0finish ", True),
+        ("Race", True),
+        ("0.10 - 0.20 Seconds margin", False),
+        ("12,50", False),
+        ("Verstappen, Max", False),
+        ("ra", False),
+        ("race " * 30, False),
+    ],
+)
+def test_looks_like_market_title(line, expected):
+    assert toto.looks_like_market_title(line) is expected
+
+
+def test_extract_text_lines_skips_hidden_content(client):
+    html = "<p>One\n two</p><noscript>Enable JS</noscript><template>t</template><script>x</script>"
+
+    assert client._extract_text_lines(html) == ["One", "two", "Enable JS"]
+    assert client._extract_text_lines(html, drop_noscript=True) == ["One", "two"]
+    assert client._extract_text_lines("  ") == []
+    assert client._extract_text_lines(
+        "<?xml version='1.0' encoding='utf-8'?><html><body><p>Pérez</p></body></html>"
+    ) == ["Pérez"]
+
+
+def test_list_outcomes_latest_returns_only_the_newest_snapshot(client, monkeypatch):
+    client.refresh(mode="requests")
+    monkeypatch.setattr(client, "_fetch_html", lambda **kwargs: PAGE.replace("3,25", "4,00"))
+    client.refresh(mode="requests")
+
+    market = client.list_markets()[0]
+    latest = client.db.list_outcomes_latest(market.id)
+
+    assert [(o.selection_name, o.odds_decimal) for o in latest] == [
+        ("Verstappen, Max", 2.5), ("Norris, Lando", 4.0), ("Pérez, Sergio", 1001.0),
+    ]
+    assert all(o.entity_id is not None for o in latest)
+    assert len(client.list_outcomes(market.id)) == 6
+    assert client.db.list_outcomes_latest(market.id + 100) == []
+
+
+def test_refresh_skips_an_unchanged_page(client, monkeypatch):
+    first = client.refresh(mode="requests")
+    assert client.last_refresh_changed is True
+
+    monkeypatch.setattr(client, "_extract_text_lines", None)
+    assert client.refresh(mode="requests") == first
+    assert client.last_refresh_changed is False
+    assert client.db.conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0] == 1
+
+
+def test_snapshot_html_is_compressed_and_legacy_rows_still_read(tmp_path):
+    path = str(tmp_path / "toto.sqlite")
+    legacy = toto.sqlite3.connect(path)
+    legacy.executescript(
+        "CREATE TABLE snapshots (id INTEGER PRIMARY KEY AUTOINCREMENT, fetched_at TEXT NOT NULL, "
+        "url TEXT NOT NULL, html_sha256 TEXT NOT NULL, html TEXT);"
+        "INSERT INTO snapshots (fetched_at,url,html_sha256,html) VALUES ('t','u','s','<p>old</p>');"
+    )
+    legacy.commit()
+    legacy.close()
+
+    db = toto.DB(path)
+    try:
+        snap = db.new_snapshot("u", PAGE)
+        stored = db.conn.execute("SELECT html,html_z FROM snapshots WHERE id=?", (snap,)).fetchone()
+
+        assert stored["html"] is None and len(stored["html_z"]) < len(PAGE)
+        assert db.get_snapshot_html(snap) == PAGE
+        assert db.get_snapshot_html(1) == "<p>old</p>"
+        assert db.get_snapshot_html(snap + 1) is None
+    finally:
+        db.close()
+
+
+def test_insert_outcomes_accepts_a_generator(tmp_path):
+    db = toto.DB(str(tmp_path / "toto.sqlite"))
+    try:
+        snap = db.new_snapshot("u", "<html></html>")
+        market = db.upsert_market("Winnaar", None, snap)
+
+        ids = db.insert_outcomes(market, ((name, odds) for name, odds in [("A", 2.0), ("B", 0.0)]), snap)
+
+        assert [(o.id, o.implied_prob) for o in db.list_outcomes(market)] == [(ids[0], 0.5), (ids[1], 0.0)]
+        assert db.insert_outcomes(market, iter(()), snap) == []
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize(("text", "expected"), [("2,50", 2.5), ("1.001,00", 1001.0), ("12.345.678,90", 12345678.9)])
+def test_parse_dutch_decimal(text, expected):
+    assert toto.parse_dutch_decimal(text) == expected
+
+
+def test_fetch_html_reuses_one_session(tmp_path, monkeypatch):
+    client = toto.TotoF1Client(db_path=str(tmp_path / "toto.sqlite"), url="https://example.invalid/odds")
+    calls = []
+
+    class Response:
+        text = "<p>ok</p>"
+
+        def raise_for_status(self):
+            pass
+
+    def fake_get(url, **kwargs):
+        calls.append((url, kwargs))
+        return Response()
+
+    monkeypatch.setattr(client._session, "get", fake_get)
+    try:
+        assert client._fetch_html(timeout=5) == client._fetch_html(timeout=5) == "<p>ok</p>"
+    finally:
+        client.close()
+
+    assert calls == [("https://example.invalid/odds", {"timeout": 5, "verify": True})] * 2
+    assert client._session.headers["User-Agent"] == toto.USER_AGENT
+
+
+def test_db_close_closes_the_connection_when_optimize_fails(tmp_path):
+    db = toto.DB(str(tmp_path / "toto.sqlite"))
+    conn = db.conn
+
+    class FailingOptimize:
+        def execute(self, sql):
+            raise toto.sqlite3.OperationalError("database is locked")
+
+        def close(self):
+            conn.close()
+
+    db.conn = FailingOptimize()
+    with pytest.raises(toto.sqlite3.OperationalError):
+        db.close()
+    with pytest.raises(toto.sqlite3.ProgrammingError):
+        conn.execute("SELECT 1")
+
+
+def test_fresh_database_creates_html_z_with_the_table(tmp_path):
+    db = toto.DB(str(tmp_path / "toto.sqlite"))
+    try:
+        (sql,) = db.conn.execute("SELECT sql FROM sqlite_master WHERE name='snapshots'").fetchone()
+        assert "html TEXT, html_z BLOB\n)" in sql  # declared, not appended by ALTER TABLE
+    finally:
+        db.close()
+
+
+def test_fetch_html_serialises_session_use(tmp_path, monkeypatch):
+    client = toto.TotoF1Client(db_path=str(tmp_path / "toto.sqlite"))
+    active, overlaps = [], []
+
+    class Response:
+        text = "<p>ok</p>"
+
+        def raise_for_status(self):
+            pass
+
+    def slow_get(url, **kwargs):
+        active.append(url)
+        overlaps.append(len(active) > 1)
+        toto.threading.Event().wait(0.01)
+        active.pop()
+        return Response()
+
+    monkeypatch.setattr(client._session, "get", slow_get)
+    threads = [toto.threading.Thread(target=client._fetch_html) for _ in range(4)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        client.close()
+
+    assert overlaps == [False] * 4
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-import re, sqlite3, hashlib, json, threading
+import re, sqlite3, hashlib, threading, zlib
+from contextlib import contextmanager
+from functools import lru_cache
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
 
 TOTO_F1_OUTRIGHTS_URL = "https://sport.toto.nl/wedden/sport/4090/formule-1/outrights"
 USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -15,6 +17,12 @@ USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
 # ---- Odds / text helpers
 ODDS_DUTCH_RE = re.compile(r"^\d{1,3}(?:\.\d{3})*,\d{2}$")
 WS_RE = re.compile(r"[ \t\xa0]+")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]+")
+SPACES_RE = re.compile(r"\s+")
+NUMERIC_RANGE_RE = re.compile(r"[\d\.\, ]+\s*-\s*[\d\.\, ]+.*")
+SECTION_KEYWORD_RE = re.compile(r"(grand prix|formula|formule|qualification|kwalificatie|sprint|race|20\d{2})")
+FORMULA_SEASON_RE = re.compile(r"(formula|formule)\s*1\s*20\d{2}")
+ALLES_TAB_RE = re.compile(r"Alles", re.I)
 
 def wsnorm(s: str) -> str:
     return WS_RE.sub(" ", s.strip())
@@ -22,32 +30,41 @@ def wsnorm(s: str) -> str:
 def parse_dutch_decimal(s: str) -> float:
     return float(s.replace(".", "").replace(",", "."))
 
+def html_sha256(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
 def implied_probability(d: float) -> float:
     return 0 if not d else 1.0/d
 
+@lru_cache(maxsize=4096)
 def canonical_key(name: str) -> str:
     k = wsnorm(name).lower()
-    k = re.sub(r"[^a-z0-9 ]+", "", k)
-    k = re.sub(r"\s+", " ", k).strip()
-    for src, tgt in [("áàäâ","a"),("éèëê","e"),("íìïî","i"),("óòöô","o"),("úùüû","u"),("ñ","n"),("ç","c")]:
-        for ch in src: k = k.replace(ch, tgt)
-    return k
+    k = NON_ALNUM_RE.sub("", k)
+    return SPACES_RE.sub(" ", k).strip()
+
+MARKET_TITLE_KEYWORD_RE = re.compile(
+    "|".join(re.escape(w) for w in (
+        "winnaar","winning","top ","constructor",
+        "kwalificatie","qualification","race","sprint",
+        "championship","marge","margin","nationality",
+        "classified","first ","any driver","number of","auto "
+    ))
+)
+MIN_MARKET_TITLE_LEN = 4  # shortest keyword ("race", "top ")
 
 def looks_like_market_title(line: str) -> bool:
-    l = wsnorm(line)
-    if len(l) > 120:
+    return _looks_like_market_title_norm(wsnorm(line))
+
+def _looks_like_market_title_norm(l: str) -> bool:
+    """``looks_like_market_title`` for a line that is already ``wsnorm``-ed."""
+    # Odds cells and short fragments can never carry a keyword
+    if not MIN_MARKET_TITLE_LEN <= len(l) <= 120 or ODDS_DUTCH_RE.match(l):
         return False
     k = l.lower()
     # Block numeric-range selections like "0.10 - 0.20 Seconds"
-    if re.fullmatch(r"[\d\.\, ]+\s*-\s*[\d\.\, ]+.*", k):
+    if NUMERIC_RANGE_RE.fullmatch(k):
         return False
-    strong = (
-        "winnaar","winning","top ","constructor",
-        "kwalificatie","qualification","race","sprint",
-        "championship","marge","margin","nationality",
-        "classified","first ","any driver","number of","auto "
-    )
-    return any(w in k for w in strong)
+    return MARKET_TITLE_KEYWORD_RE.search(k) is not None
 
 # ---- Data classes
 @dataclass
@@ -65,7 +82,7 @@ class Entity: id:int; type:Optional[str]; canonical_name:str; canonical_key:str
 SCHEMA = """
 PRAGMA journal_mode=WAL; PRAGMA foreign_keys=ON;
 CREATE TABLE IF NOT EXISTS snapshots (
-  id INTEGER PRIMARY KEY AUTOINCREMENT, fetched_at TEXT NOT NULL, url TEXT NOT NULL, html_sha256 TEXT NOT NULL, html TEXT
+  id INTEGER PRIMARY KEY AUTOINCREMENT, fetched_at TEXT NOT NULL, url TEXT NOT NULL, html_sha256 TEXT NOT NULL, html TEXT, html_z BLOB
 );
 CREATE TABLE IF NOT EXISTS sections (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL UNIQUE);
 CREATE TABLE IF NOT EXISTS events (id INTEGER PRIMARY KEY AUTOINCREMENT, section_id INTEGER NULL REFERENCES sections(id) ON DELETE SET NULL, name TEXT NOT NULL, UNIQUE(name));
@@ -74,57 +91,110 @@ CREATE TABLE IF NOT EXISTS outcomes (id INTEGER PRIMARY KEY AUTOINCREMENT, marke
 CREATE TABLE IF NOT EXISTS entities (id INTEGER PRIMARY KEY AUTOINCREMENT, type TEXT NULL, canonical_name TEXT NOT NULL, canonical_key TEXT NOT NULL UNIQUE);
 CREATE TABLE IF NOT EXISTS entity_aliases (id INTEGER PRIMARY KEY AUTOINCREMENT, entity_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE, alias TEXT NOT NULL, alias_key TEXT NOT NULL, first_seen_snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE, last_seen_snapshot_id INTEGER NOT NULL REFERENCES snapshots(id) ON DELETE CASCADE, UNIQUE(entity_id, alias_key));
 CREATE TABLE IF NOT EXISTS outcome_entities (outcome_id INTEGER PRIMARY KEY REFERENCES outcomes(id) ON DELETE CASCADE, entity_id INTEGER NOT NULL REFERENCES entities(id) ON DELETE CASCADE);
+CREATE INDEX IF NOT EXISTS idx_outcomes_market_snapshot ON outcomes(market_id, snapshot_id);
+CREATE INDEX IF NOT EXISTS idx_outcome_entities_entity ON outcome_entities(entity_id);
 """
+# WAL makes synchronous=NORMAL crash-safe; the rest trims page churn on reads
+CONNECTION_PRAGMAS = """
+PRAGMA synchronous={synchronous}; PRAGMA temp_store=MEMORY; PRAGMA cache_size=-20000;
+PRAGMA mmap_size=268435456;
+"""
+SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+HTML_COMPRESSION_LEVEL = 6  # zlib level for snapshots.html_z
 
 class DB:
-    def __init__(self, path="toto_f1.sqlite"):
+    def __init__(self, path="toto_f1.sqlite", synchronous="NORMAL"):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_LEVELS)}")
         self._lock = threading.RLock()
         self.conn = sqlite3.connect(path, check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self._tx_depth = 0
         with self._lock:
             self.conn.executescript(SCHEMA)
+            self._migrate()
+            self.conn.executescript(CONNECTION_PRAGMAS.format(synchronous=synchronous))
             self.conn.commit()
 
-    def new_snapshot(self, url, html)->int:
-        sha = hashlib.sha256(html.encode("utf-8")).hexdigest()
+    def _migrate(self):
+        # Files created before compression lack html_z; their snapshots keep text in ``html``
+        columns = {r["name"] for r in self.conn.execute("PRAGMA table_info(snapshots)")}
+        if "html_z" not in columns:
+            self.conn.execute("ALTER TABLE snapshots ADD COLUMN html_z BLOB")
+
+    @contextmanager
+    def transaction(self):
+        """Hold the lock and defer helper commits until the outermost block exits."""
+        with self._lock:
+            self._tx_depth += 1
+            try:
+                yield self
+            except BaseException:
+                self._tx_depth -= 1
+                if not self._tx_depth: self.conn.rollback()
+                raise
+            self._tx_depth -= 1
+            if not self._tx_depth: self.conn.commit()
+
+    def _commit(self):
+        if not self._tx_depth: self.conn.commit()
+
+    def latest_snapshot_id(self, url, sha)->Optional[int]:
+        """Return the newest snapshot's id if it stored exactly this page, else None."""
+        with self._lock:
+            row = self.conn.execute("SELECT id,url,html_sha256 FROM snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        return row["id"] if row and row["url"]==url and row["html_sha256"]==sha else None
+
+    def new_snapshot(self, url, html, sha=None)->int:
+        sha = sha or html_sha256(html)
         with self._lock:
             cur = self.conn.execute(
-                "INSERT INTO snapshots (fetched_at,url,html_sha256,html) VALUES (?,?,?,?)",
-                (datetime.now(timezone.utc).replace(microsecond=0).isoformat(), url, sha, html),
+                "INSERT INTO snapshots (fetched_at,url,html_sha256,html_z) VALUES (?,?,?,?)",
+                (datetime.now(timezone.utc).replace(microsecond=0).isoformat(), url, sha,
+                 zlib.compress(html.encode("utf-8"), HTML_COMPRESSION_LEVEL)),
             )
-            self.conn.commit()
+            self._commit()
             return cur.lastrowid
 
+    def get_snapshot_html(self, snapshot_id)->Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT html,html_z FROM snapshots WHERE id=?",(snapshot_id,)).fetchone()
+        if row is None: return None
+        if row["html_z"] is not None: return zlib.decompress(row["html_z"]).decode("utf-8")
+        return row["html"]
+
     def upsert_section(self, title:str)->int:
         with self._lock:
-            self.conn.execute("INSERT OR IGNORE INTO sections (title) VALUES (?)",(title,))
-            self.conn.commit()
-            return self.conn.execute("SELECT id FROM sections WHERE title=?",(title,)).fetchone()["id"]
+            row = self.conn.execute(
+                "INSERT INTO sections (title) VALUES (?) "
+                "ON CONFLICT(title) DO UPDATE SET title=excluded.title RETURNING id",
+                (title,),
+            ).fetchone()
+            self._commit()
+            return row[0]
 
     def upsert_event(self, name, section_id)->int:
         with self._lock:
-            self.conn.execute("INSERT OR IGNORE INTO events (name,section_id) VALUES (?,?)",(name, section_id))
-            self.conn.commit()
-            row = self.conn.execute("SELECT id,section_id FROM events WHERE name=?",(name,)).fetchone()
-            if row and section_id and row["section_id"]!=section_id:
-                self.conn.execute("UPDATE events SET section_id=? WHERE id=?",(section_id,row["id"]))
-                self.conn.commit()
-            return row["id"]
+            row = self.conn.execute(
+                "INSERT INTO events (name,section_id) VALUES (?,?) "
+                "ON CONFLICT(name) DO UPDATE SET section_id=COALESCE(excluded.section_id, events.section_id) "
+                "RETURNING id",
+                (name, section_id or None),
+            ).fetchone()
+            self._commit()
+            return row[0]
 
     def upsert_market(self, name, event_id, snapshot_id)->int:
         with self._lock:
-            self.conn.execute(
-                "INSERT OR IGNORE INTO markets (name,event_id,last_seen_snapshot_id) VALUES (?,?,?)",
-                (name,event_id,snapshot_id),
-            )
-            self.conn.commit()
-            row = self.conn.execute("SELECT id,event_id FROM markets WHERE name=?",(name,)).fetchone()
-            self.conn.execute("UPDATE markets SET last_seen_snapshot_id=? WHERE id=?",(snapshot_id,row["id"]))
-            self.conn.commit()
-            if event_id and row["event_id"]!=event_id:
-                self.conn.execute("UPDATE markets SET event_id=? WHERE id=?",(event_id,row["id"]))
-                self.conn.commit()
-            return row["id"]
+            row = self.conn.execute(
+                "INSERT INTO markets (name,event_id,last_seen_snapshot_id) VALUES (?,?,?) "
+                "ON CONFLICT(name) DO UPDATE SET last_seen_snapshot_id=excluded.last_seen_snapshot_id, "
+                "event_id=COALESCE(excluded.event_id, markets.event_id) RETURNING id",
+                (name, event_id or None, snapshot_id),
+            ).fetchone()
+            self._commit()
+            return row[0]
 
     def insert_outcome(self, market_id, selection_name, odds_decimal, snapshot_id)->int:
         imp = implied_probability(odds_decimal)
@@ -134,45 +204,77 @@ class DB:
                 "VALUES (?,?,?,?,?)",
                 (market_id, selection_name, odds_decimal, imp, snapshot_id),
             )
-            self.conn.commit()
+            self._commit()
             return cur.lastrowid
 
+    def insert_outcomes(self, market_id, selections, snapshot_id)->List[int]:
+        """Insert ``(selection_name, odds_decimal)`` pairs; return their ids in order."""
+        # Streamed into executemany one tuple at a time; implied_probability inlined
+        rows = ((market_id, sel, odds, 1.0/odds if odds else 0, snapshot_id) for sel, odds in selections)
+        with self._lock:
+            inserted = self.conn.executemany(
+                "INSERT INTO outcomes (market_id,selection_name,odds_decimal,implied_prob,snapshot_id) "
+                "VALUES (?,?,?,?,?)",
+                rows,
+            ).rowcount
+            if inserted <= 0:
+                return []
+            # Ids are monotonic and the lock is held, so the newest rows are ours
+            ids = [r[0] for r in self.conn.execute(
+                "SELECT id FROM outcomes WHERE market_id=? AND snapshot_id=? ORDER BY id DESC LIMIT ?",
+                (market_id, snapshot_id, inserted),
+            )]
+            self._commit()
+            ids.reverse()
+            return ids
+
     def upsert_entity_with_alias(self, name, snapshot_id, typ=None)->int:
         key = canonical_key(name)
         with self._lock:
-            row = self.conn.execute("SELECT id FROM entities WHERE canonical_key=?",(key,)).fetchone()
-            if row:
-                entity_id = row["id"]
-                self._upsert_alias(entity_id, name, snapshot_id)
-                return entity_id
-            cur = self.conn.execute(
-                "INSERT INTO entities (type,canonical_name,canonical_key) VALUES (?,?,?)",
+            # The no-op DO UPDATE keeps the first type/name and still returns the id
+            entity_id = self.conn.execute(
+                "INSERT INTO entities (type,canonical_name,canonical_key) VALUES (?,?,?) "
+                "ON CONFLICT(canonical_key) DO UPDATE SET canonical_key=excluded.canonical_key RETURNING id",
                 (typ,name,key),
-            )
-            self.conn.commit()
-            entity_id = cur.lastrowid
-            self._upsert_alias(entity_id, name, snapshot_id)
+            ).fetchone()[0]
+            self._upsert_alias(entity_id, name, snapshot_id, key)
             return entity_id
 
-    def _upsert_alias(self, entity_id, alias, snapshot_id):
-        ak = canonical_key(alias)
+    def upsert_entities_with_aliases(self, names_and_types, snapshot_id)->dict:
+        """Batch ``upsert_entity_with_alias`` over ``(name, type)`` pairs; return ``{name: entity_id}``."""
         with self._lock:
-            row = self.conn.execute(
-                "SELECT id FROM entity_aliases WHERE entity_id=? AND alias_key=?",
-                (entity_id,ak),
-            ).fetchone()
-            if row:
-                self.conn.execute(
-                    "UPDATE entity_aliases SET last_seen_snapshot_id=? WHERE id=?",
-                    (snapshot_id,row["id"]),
-                )
-            else:
-                self.conn.execute(
-                    "INSERT INTO entity_aliases (entity_id,alias,alias_key,first_seen_snapshot_id,last_seen_snapshot_id) "
-                    "VALUES (?,?,?,?,?)",
-                    (entity_id,alias,ak,snapshot_id,snapshot_id),
-                )
-            self.conn.commit()
+            known = dict(self.conn.execute("SELECT canonical_key,id FROM entities"))
+            ids, aliases = {}, {}
+            for name, typ in names_and_types:
+                if name in ids: continue
+                key = canonical_key(name)
+                entity_id = known.get(key)
+                if entity_id is None:
+                    entity_id = known[key] = self.conn.execute(
+                        "INSERT INTO entities (type,canonical_name,canonical_key) VALUES (?,?,?) RETURNING id",
+                        (typ,name,key),
+                    ).fetchone()[0]
+                ids[name] = entity_id
+                aliases.setdefault((entity_id,key), (entity_id,name,key,snapshot_id,snapshot_id))
+            self.conn.executemany(
+                "INSERT INTO entity_aliases (entity_id,alias,alias_key,first_seen_snapshot_id,last_seen_snapshot_id) "
+                "VALUES (?,?,?,?,?) ON CONFLICT(entity_id,alias_key) "
+                "DO UPDATE SET last_seen_snapshot_id=excluded.last_seen_snapshot_id",
+                aliases.values(),
+            )
+            self._commit()
+            return ids
+
+    def _upsert_alias(self, entity_id, alias, snapshot_id, alias_key=None):
+        ak = alias_key if alias_key is not None else canonical_key(alias)
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO entity_aliases (entity_id,alias,alias_key,first_seen_snapshot_id,last_seen_snapshot_id) "
+                "VALUES (?,?,?,?,?) ON CONFLICT(entity_id,alias_key) "
+                "DO UPDATE SET last_seen_snapshot_id=excluded.last_seen_snapshot_id",
+                (entity_id,alias,ak,snapshot_id,snapshot_id),
+            )
+            self._commit()
 
     def link_outcome_entity(self, outcome_id, entity_id):
         with self._lock:
@@ -180,46 +282,52 @@ class DB:
                 "INSERT OR IGNORE INTO outcome_entities (outcome_id,entity_id) VALUES (?,?)",
                 (outcome_id,entity_id),
             )
-            self.conn.commit()
+            self._commit()
+
+    def link_outcome_entities(self, pairs):
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO outcome_entities (outcome_id,entity_id) VALUES (?,?)",
+                pairs,
+            )
+            self._commit()
 
     def list_outcomes_latest(self, market_id: int):
+        # upsert_market stamps the market with every snapshot that carried its outcomes
         with self._lock:
-            snap = self.conn.execute(
-                "SELECT MAX(snapshot_id) AS s FROM outcomes WHERE market_id=?",
-                (market_id,),
-            ).fetchone()["s"]
             rows = self.conn.execute(
                 """SELECT o.id,o.market_id,o.selection_name,o.odds_decimal,o.implied_prob,oe.entity_id
-                FROM outcomes o
+                FROM markets m
+                JOIN outcomes o ON o.market_id=m.id AND o.snapshot_id=m.last_seen_snapshot_id
                 LEFT JOIN outcome_entities oe ON oe.outcome_id=o.id
-                WHERE o.market_id=? AND o.snapshot_id=?
+                WHERE m.id=?
                 ORDER BY o.id""",
-                (market_id, snap),
+                (market_id,),
             ).fetchall()
-            return [Outcome(**dict(r)) for r in rows]
+            return [Outcome(*r) for r in rows]
 
     # public API
     def list_sections(self)->List[Section]:
         with self._lock:
-            return [Section(**dict(r)) for r in self.conn.execute("SELECT id,title FROM sections ORDER BY id")]
+            return [Section(*r) for r in self.conn.execute("SELECT id,title FROM sections ORDER BY id")]
     def list_events(self, section_id:Optional[int]=None)->List[Event]:
         q="SELECT id,section_id,name FROM events"; args=()
         if section_id: q+=" WHERE section_id=?"; args=(section_id,)
         q+=" ORDER BY id"
         with self._lock:
-            return [Event(**dict(r)) for r in self.conn.execute(q,args)]
+            return [Event(*r) for r in self.conn.execute(q,args)]
     def list_markets(self, event_id:Optional[int]=None)->List[Market]:
         q="SELECT id,event_id,name FROM markets"; args=()
         if event_id: q+=" WHERE event_id=?"; args=(event_id,)
         q+=" ORDER BY id"
         with self._lock:
-            return [Market(**dict(r)) for r in self.conn.execute(q,args)]
+            return [Market(*r) for r in self.conn.execute(q,args)]
     def list_outcomes(self, market_id:int)->List[Outcome]:
         q = """SELECT o.id,o.market_id,o.selection_name,o.odds_decimal,o.implied_prob,oe.entity_id
                FROM outcomes o LEFT JOIN outcome_entities oe ON oe.outcome_id=o.id
                WHERE o.market_id=? ORDER BY o.id"""
         with self._lock:
-            return [Outcome(**dict(r)) for r in self.conn.execute(q,(market_id,))]
+            return [Outcome(*r) for r in self.conn.execute(q,(market_id,))]
     def find_entity(self, name_or_alias:str)->Optional[Entity]:
         k = canonical_key(name_or_alias)
         with self._lock:
@@ -229,7 +337,7 @@ class DB:
                                      WHERE e.canonical_key=? OR a.alias_key=? LIMIT 1""",
                 (k,k),
             ).fetchone()
-            return Entity(**dict(r)) if r else None
+            return Entity(*r) if r else None
     def entity_aliases(self, entity_id:int)->List[Tuple[str,int,int]]:
         with self._lock:
             return [
@@ -244,13 +352,30 @@ class DB:
                FROM outcomes o JOIN outcome_entities oe ON oe.outcome_id=o.id JOIN markets m ON m.id=o.market_id
                WHERE oe.entity_id=? ORDER BY o.snapshot_id,o.id"""
         with self._lock:
-            return [dict(r) for r in self.conn.execute(q,(entity_id,))]
+            cur = self.conn.execute(q,(entity_id,))
+            cols = [c[0] for c in cur.description]
+            return [dict(zip(cols,r)) for r in cur]
+    def optimize(self):
+        """Let SQLite refresh planner statistics for tables whose shape has changed."""
+        with self._lock:
+            self.conn.execute("PRAGMA optimize")
     def close(self):
         with self._lock:
-            self.conn.close()
+            try:
+                self.conn.execute("PRAGMA optimize")
+            finally:
+                self.conn.close()
 
 
 # ---- Scraper
+def _visible_text_xpath(*hidden_tags: str) -> etree.XPath:
+    # Filtering by ancestor leaves the tree intact: dropping nodes would merge
+    # their tail text into the preceding line
+    return etree.XPath("//text()[" + " and ".join(f"not(ancestor::{t})" for t in hidden_tags) + "]")
+
+VISIBLE_TEXT_XPATH = _visible_text_xpath("script", "style", "template")
+VISIBLE_TEXT_RENDERED_XPATH = _visible_text_xpath("script", "style", "template", "noscript")
+
 def guess_entity_type(n:str)->Optional[str]:
     l = n.lower()
     if "," in n: return "driver"
@@ -258,11 +383,31 @@ def guess_entity_type(n:str)->Optional[str]:
         return "team"
     return None
 
+# Clicks every control whose label starts with ``needle`` in one round-trip; returns the count
+EXPAND_ALL_JS = """(needle) => {
+  let clicked = 0;
+  for (const el of document.querySelectorAll("button, a, [role=button]")) {
+    if ((el.innerText || "").trim().toLowerCase().startsWith(needle)) { el.click(); clicked++; }
+  }
+  return clicked;
+}"""
+
 class TotoF1Client:
     def __init__(self, db_path="toto_f1.sqlite", url=TOTO_F1_OUTRIGHTS_URL):
         self.db = DB(db_path); self.url = url
+        self.last_refresh_changed: Optional[bool] = None
+        # Kept for the client's lifetime so repeated requests-mode refreshes reuse the
+        # TLS connection; refresh runs on worker threads and Session is not thread-safe
+        self._session = requests.Session()
+        self._session.headers.update({"User-Agent": USER_AGENT})
+        self._session_lock = threading.Lock()
 
     def refresh(self, mode="auto", timeout=25, verify_tls=True) -> int:
+        """Fetch and store the outrights page; return the snapshot id it is stored under.
+
+        An unchanged page reuses the previous snapshot without parsing or writing;
+        ``last_refresh_changed`` records which case happened.
+        """
         used_playwright = False
         html = None
         if mode in ("auto", "playwright"):
@@ -276,25 +421,42 @@ class TotoF1Client:
             html = self._fetch_html(timeout=timeout, verify_tls=verify_tls)
             used_playwright = False
 
-        snap_id = self.db.new_snapshot(self.url, html)
+        sha = html_sha256(html)
+        unchanged_id = self.db.latest_snapshot_id(self.url, sha)
+        self.last_refresh_changed = unchanged_id is None
+        if unchanged_id is not None:
+            return unchanged_id
+
         lines = self._extract_text_lines(html, drop_noscript=used_playwright)
         sections = self._extract_sections(lines)
-        sec_ids = {s:self.db.upsert_section(s) for s in sections}
-
-        for market_title, items in self._extract_market_blocks(lines):
-            event_id = None
-            # naive event association: attach to section if suffix word appears
-            maybe_section = self._match_section_for_market(market_title, sections)
-            if maybe_section:
-                event_id = self.db.upsert_event(maybe_section, sec_ids.get(maybe_section))
-            m_id = self.db.upsert_market(market_title, event_id, snap_id)
-            for sel, odd in items:
-                if not ODDS_DUTCH_RE.match(odd): continue
-                outcome_id = self.db.insert_outcome(m_id, sel, parse_dutch_decimal(odd), snap_id)
-                ent_id = self.db.upsert_entity_with_alias(sel, snap_id, guess_entity_type(sel))
-                self.db.link_outcome_entity(outcome_id, ent_id)
+        blocks = self._extract_market_blocks(lines)
+
+        # One transaction per refresh: a single commit instead of one per row
+        with self.db.transaction():
+            snap_id = self.db.new_snapshot(self.url, html, sha)
+            sec_ids = {s:self.db.upsert_section(s) for s in sections}
+            market_selections = [
+                (market_title, [(sel, parse_dutch_decimal(odd)) for sel, odd in items if ODDS_DUTCH_RE.match(odd)])
+                for market_title, items in blocks
+            ]
+            entity_ids = self.db.upsert_entities_with_aliases(
+                ((sel, guess_entity_type(sel)) for _, selections in market_selections for sel, _ in selections),
+                snap_id,
+            )
+            for market_title, selections in market_selections:
+                event_id = None
+                # naive event association: attach to section if suffix word appears
+                maybe_section = self._match_section_for_market(market_title, sections)
+                if maybe_section:
+                    event_id = self.db.upsert_event(maybe_section, sec_ids.get(maybe_section))
+                m_id = self.db.upsert_market(market_title, event_id, snap_id)
+                outcome_ids = self.db.insert_outcomes(m_id, selections, snap_id)
+                self.db.link_outcome_entities(zip(outcome_ids, (entity_ids[sel] for sel, _ in selections)))
+        self.db.optimize()
         return snap_id
     def close(self):
+        with self._session_lock:
+            self._session.close()
         self.db.close()
 
     # public API passthroughs
@@ -308,7 +470,8 @@ class TotoF1Client:
 
     # ---- internals
     def _fetch_html(self, timeout=25, verify_tls=True)->str:
-        r = requests.get(self.url, headers={"User-Agent": USER_AGENT}, timeout=timeout, verify=verify_tls)
+        with self._session_lock:
+            r = self._session.get(self.url, timeout=timeout, verify=verify_tls)
         r.raise_for_status(); return r.text
 
     def _fetch_rendered_html(self, timeout=30)->str:
@@ -326,30 +489,29 @@ class TotoF1Client:
             page.wait_for_load_state("networkidle", timeout=timeout*1000)
 
             # Click "Alles" tab if present (ensures combined view)
-            try: page.get_by_role("link", name=re.compile(r"Alles", re.I)).first.click(timeout=1500)
+            try: page.get_by_role("link", name=ALLES_TAB_RE).first.click(timeout=1500)
             except Exception: pass
 
-            # Expand ALL "Bekijk meer" buttons
-            # Re-query until none remain or iteration cap reached
+            # Expand ALL "Bekijk meer" buttons, one in-page click pass per round
+            # Re-run until none remain or iteration cap reached
             for _ in range(12):
-                buttons = page.locator("text=Bekijk meer")
-                count = buttons.count()
-                if count == 0: break
-                for i in range(count):
-                    try: buttons.nth(i).click(timeout=1500)
-                    except Exception: pass
-                page.wait_for_timeout(600)  # let content append
+                if not page.evaluate(EXPAND_ALL_JS, "bekijk meer"): break
+                page.wait_for_timeout(400)  # let content append
             html = page.content()
             ctx.close(); browser.close()
             return html
 
     def _extract_text_lines(self, html: str, drop_noscript: bool = False):
-        soup = BeautifulSoup(html, "lxml")
-        # Always drop script/style; drop noscript only when content came from Playwright
-        for tag in soup(["script", "style"] + (["noscript"] if drop_noscript else [])):
-            tag.decompose()
-        text = soup.get_text("\n")
-        return [wsnorm(x) for x in text.splitlines() if wsnorm(x)]
+        if not html.strip():
+            return []
+        try:
+            # As UTF-8 bytes: lxml rejects str input that carries an XML encoding declaration
+            tree = lxml_html.fromstring(html.encode("utf-8"), parser=lxml_html.HTMLParser(encoding="utf-8"))
+        except etree.ParserError:
+            return []
+        # Always skip script/style/template; skip noscript only when content came from Playwright
+        visible_text = VISIBLE_TEXT_RENDERED_XPATH if drop_noscript else VISIBLE_TEXT_XPATH
+        return [n for t in visible_text(tree) for x in t.splitlines() if (n := wsnorm(x))]
 
 
     def _extract_sections(self, lines):
@@ -367,7 +529,7 @@ class TotoF1Client:
                     break
                 else:
                     continue
-            if re.search(r"(grand prix|formula|formule|qualification|kwalificatie|sprint|race|20\d{2})", low):
+            if SECTION_KEYWORD_RE.search(low):
                 if sl not in tabs:
                     tabs.append(sl)
             elif len(tabs) >= 3:
@@ -390,16 +552,16 @@ class TotoF1Client:
 
         i = 0
         while i < len(lines):
-            ln = wsnorm(lines[i])
+            ln = lines[i]  # _extract_text_lines already applied wsnorm
 
-            if title is None and looks_like_market_title(ln):
+            if title is None and _looks_like_market_title_norm(ln):
                 title = ln; i += 1; continue
 
             if title is not None:
                 if ln.lower().startswith("bekijk meer"):
                     i += 1; continue
                 # start a new market only on a strong title
-                if looks_like_market_title(ln):
+                if _looks_like_market_title_norm(ln):
                     flush(); title = ln; i += 1; continue
                 if i + 1 < len(lines) and ODDS_DUTCH_RE.match(lines[i+1]):
                     items.append((ln, lines[i+1])); i += 2; continue
@@ -415,7 +577,7 @@ class TotoF1Client:
                 return s
         # Fallback: season markets → Formula 1 YYYY if present
         for s in sections:
-            if re.search(r"(formula|formule)\s*1\s*20\d{2}", s.lower()): return s
+            if FORMULA_SEASON_RE.search(s.lower()): return s
         return None
 
 # ---- CLI